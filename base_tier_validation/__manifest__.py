@@ -3,7 +3,7 @@
 {
     "name": "Base Tier Validation",
     "summary": "Implement a validation process based on tiers.",
-    "version": "18.0.1.1.3",
+    "version": "18.0.1.2.0",
     "development_status": "Mature",
     "maintainers": ["LoisRForgeFlow"],
     "category": "Tools",
@@ -21,6 +21,7 @@
         "views/res_config_settings_views.xml",
         "views/tier_definition_view.xml",
         "views/tier_review_view.xml",
+        "views/tier_review_inbox_view.xml",
         "views/tier_validation_exception_view.xml",
         "wizard/comment_wizard_view.xml",
         "templates/tier_validation_templates.xml",
@@ -0,0 +1,9 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import SUPERUSER_ID, api
+
+
+def migrate(cr, version):
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    # The pending reviewers table is new: fill it from the open reviews, it
+    # is kept up to date by the reviews afterwards
+    env["tier.review.pending"]._rebuild()
@@ -3,6 +3,9 @@
 from . import tier_definition
 from . import tier_validation_exception
 from . import tier_review
+from . import tier_review_pending
+from . import tier_review_inbox
 from . import tier_validation
 from . import res_users
+from . import res_groups
 from . import res_config_settings
@@ -9,6 +9,10 @@ class ResConfigSettings(models.TransientModel):
     # Activate me back when modules are migrated
 
     module_base_tier_validation_formula = fields.Boolean(string="Tier Formula")
+    tier_review_reminder_digest = fields.Boolean(
+        string="Tier Review Reminder Digest",
+        config_parameter="base_tier_validation.reminder_digest",
+    )
     # module_base_tier_validation_forward = fields.Boolean("Tier Forward & Backward")
     # module_base_tier_validation_server_action = fields.Boolean("Tier Server Action")
     # module_base_tier_validation_report = fields.Boolean("Tier Reports")
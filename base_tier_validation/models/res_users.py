@@ -2,6 +2,9 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
 from odoo import api, fields, models, modules
+from odoo.tools import SQL
+
+from odoo.addons.base.models.res_users import is_reified_group
 
 
 class Users(models.Model):
@@ -9,47 +12,98 @@ class Users(models.Model):
 
     review_ids = fields.Many2many(string="Reviews", comodel_name="tier.review")
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        users = super().create(vals_list)
+        self.env["tier.review"]._recompute_group_reviewers(users.groups_id)
+        return users
+
+    def write(self, vals):
+        # The user form sends the groups as reified in_group_*/sel_groups_*
+        # fields, turned into groups_id further down the write
+        groups_changed = "groups_id" in vals or any(map(is_reified_group, vals))
+        groups = self.env["res.groups"]
+        if groups_changed:
+            groups = self.groups_id
+        res = super().write(vals)
+        if groups_changed:
+            self.env["tier.review"]._recompute_group_reviewers(
+                groups | self.groups_id
+            )
+        return res
+
     @api.model
     def review_user_count(self):
-        user_reviews = {}
+        return self._get_review_user_counters()
+
+    @api.model
+    def _get_review_user_counters(self):
+        """Count the documents the current user can review per model in a
+        single query on the pending reviewers table. The documents of each
+        model are restricted by the record rules of the user and exclude the
+        cancelled and rejected ones."""
         user = self.env.user
-        domain = [
-            ("status", "=", "pending"),
-            ("can_review", "=", True),
-            ("id", "in", user.review_ids.ids),
-        ]
-        review_groups = self.env["tier.review"]._read_group(
-            domain=domain,
-            groupby=["model"],
-            aggregates=["id:recordset"],
-        )
-        for model, tier_review in review_groups:
-            Model = self.env[model]
-            # Skip Models not having Tier Validation enabled (example: was unistalled)
-            if tier_review and hasattr(Model, "can_review"):
-                records_domain = [
-                    ("id", "in", tier_review.mapped("res_id")),
-                    ("rejected", "=", False),
-                    ("can_review", "=", True),
-                ]
-                records = (
-                    Model.with_user(user)
-                    .with_context(active_test=False)
-                    .search(records_domain)
+        self.env["tier.review"].flush_model(["model", "res_id", "status"])
+        conditions = []
+        for model in self.env.registry.descendants(["tier.validation"], "_inherit"):
+            Model = self.env[model].with_context(active_test=False)
+            # Skip Models not having Tier Validation enabled
+            if Model._abstract or not Model.has_access("read"):
+                continue
+            domain = []
+            if Model._state_field in Model._fields:
+                Model.flush_model([Model._state_field])
+                domain = [(Model._state_field, "!=", Model._cancel_state)]
+            conditions.append(
+                SQL(
+                    "(pending.model = %s AND pending.res_id IN %s)",
+                    model,
+                    Model._search(domain).subselect(),
                 )
-                # Excludes any cancelled records depending on the structure of the model
-                if Model._state_field in Model._fields:
-                    records = records.filtered(
-                        lambda x: x[x._state_field] != x._cancel_state
+            )
+        if not conditions:
+            return []
+        Pending = self.env["tier.review.pending"]
+        Pending._refresh_dirty()
+        rows = self.env.execute_query(
+            SQL(
+                """
+                SELECT pending.model, MIN(pending.res_id),
+                    COUNT(DISTINCT pending.res_id)
+                FROM %(pending_table)s pending
+                WHERE pending.user_id = %(user_id)s
+                    AND NOT EXISTS (
+                        SELECT 1 FROM tier_review rejected
+                        WHERE rejected.model = pending.model
+                            AND rejected.res_id = pending.res_id
+                            AND rejected.status = 'rejected'
                     )
-                if records:
-                    user_reviews[model] = {
-                        "id": records[0].id,
-                        "name": Model._description,
-                        "model": model,
-                        "active_field": "active" in Model._fields,
-                        "icon": modules.module.get_module_icon(Model._original_module),
-                        "type": "tier_review",
-                        "pending_count": len(records),
-                    }
-        return list(user_reviews.values())
+                    AND (%(conditions)s)
+                GROUP BY pending.model
+                ORDER BY pending.model
+                """,
+                pending_table=SQL.identifier(Pending._table),
+                user_id=user.id,
+                conditions=SQL(" OR ").join(conditions),
+            )
+        )
+        return [
+            dict(
+                self._get_review_group_values(model),
+                id=res_id,
+                pending_count=count,
+            )
+            for model, res_id, count in rows
+        ]
+
+    @api.model
+    def _get_review_group_values(self, model):
+        """Values describing the systray group of ``model`` reviews."""
+        Model = self.env[model]
+        return {
+            "name": Model._description,
+            "model": model,
+            "active_field": "active" in Model._fields,
+            "icon": modules.module.get_module_icon(Model._original_module),
+            "type": "tier_review",
+        }
@@ -1,7 +1,11 @@
 # Copyright 2017 ForgeFlow S.L. (https://www.forgeflow.com)
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import api, fields, models
+import time
+from ast import literal_eval
+
+from odoo import api, fields, models, modules, tools
+from odoo.tools import SQL, split_every
 
 
 class TierDefinition(models.Model):
@@ -109,6 +113,68 @@ class TierDefinition(models.Model):
         "by same reviewer",
     )
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return res
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @tools.ormcache("model_name", "company_id")
+    def _get_tier_definition_ids(self, model_name, company_id):
+        """Ids of the active definitions applying to documents of
+        ``model_name`` in ``company_id``, by descending sequence."""
+        return tuple(
+            self.sudo()
+            .with_context(active_test=True)
+            .search(
+                [
+                    ("model", "=", model_name),
+                    ("company_id", "in", [False, company_id]),
+                ],
+                order="sequence desc, id",
+            )
+            .ids
+        )
+
+    @api.model
+    def _get_tier_definitions(self, model_name, company):
+        """Cached version of the definitions search done for each document."""
+        return self.browse(self._get_tier_definition_ids(model_name, company.id))
+
+    @api.model
+    @tools.ormcache("model_name")
+    def _get_reviewer_field_names(self, model_name):
+        """Names of the fields of ``model_name`` holding reviewers."""
+        definitions = (
+            self.sudo()
+            .with_context(active_test=False)
+            .search([("model", "=", model_name), ("review_type", "=", "field")])
+        )
+        return frozenset(definitions.reviewer_field_id.mapped("name"))
+
+    @api.model
+    @tools.ormcache("definition_domain")
+    def _parse_definition_domain(self, definition_domain):
+        return tuple(literal_eval(definition_domain))
+
+    def _get_definition_domain(self):
+        """Return the parsed definition_domain, parsed once per domain text."""
+        self.ensure_one()
+        if not self.definition_domain:
+            return []
+        return list(self._parse_definition_domain(self.definition_domain))
+
     @api.onchange("review_type")
     def onchange_review_type(self):
         self.reviewer_id = None
@@ -130,32 +196,77 @@ class TierDefinition(models.Model):
                 rec.model, IrModelFields
             )
 
-    def _get_review_needing_reminder(self):
-        """Return all the reviews that have the reminder setup."""
-        self.ensure_one()
-        if not self.notify_reminder_delay:
-            return self.env["tier.review"]
-        review_date = fields.Datetime.subtract(
-            fields.Datetime.now(), days=self.notify_reminder_delay
+    @api.model
+    def _get_review_ids_needing_reminder(self):
+        """Ids of the open reviews due for a reminder, for all the active
+        definitions with a reminder delay, in a single query."""
+        self.env["tier.review"].flush_model(
+            ["definition_id", "status", "create_date", "last_reminder_date"]
         )
-        return self.env["tier.review"].search(
-            [
-                ("definition_id", "=", self.id),
-                ("status", "in", ["waiting", "pending"]),
-                "|",
-                "&",
-                ("create_date", "<", review_date),
-                ("last_reminder_date", "=", False),
-                ("last_reminder_date", "<", review_date),
-            ],
-            limit=1,
+        self.flush_model(["active", "notify_reminder_delay"])
+        rows = self.env.execute_query(
+            SQL(
+                """
+                SELECT review.id
+                  FROM tier_review review
+                  JOIN tier_definition definition
+                    ON definition.id = review.definition_id
+                 WHERE definition.active
+                   AND definition.notify_reminder_delay > 0
+                   AND review.status IN ('waiting', 'pending')
+                   AND COALESCE(review.last_reminder_date, review.create_date)
+                       < %(now)s - make_interval(
+                           days => definition.notify_reminder_delay
+                       )
+              ORDER BY review.id
+                """,
+                now=fields.Datetime.now(),
+            )
         )
+        return [review_id for (review_id,) in rows]
 
-    def _cron_send_review_reminder(self):
-        definition_with_reminder = self.env["tier.definition"].search(
-            [("notify_reminder_delay", ">", 0)]
+    @api.model
+    def _cron_send_review_reminder(self, batch_size=200, time_budget=600):
+        """Send the reminders of all the due reviews by batches of
+        ``batch_size``, committing after each batch.
+
+        The run stops once ``time_budget`` seconds are spent. The reminded
+        reviews are no longer due, so the next run resumes with the others,
+        and the cron is triggered again right away while reviews remain.
+        In digest mode the batches are made of ``batch_size`` reviewers, so
+        that each reviewer gets a single message for all its due reviews.
+        """
+        Review = self.env["tier.review"]
+        review_ids = self._get_review_ids_needing_reminder()
+        if Review._is_reminder_digest_enabled():
+            review_ids_by_user = Review.browse(
+                review_ids
+            )._get_review_ids_by_reviewer()
+            batches = [
+                (users, sorted(set().union(*map(review_ids_by_user.get, users))))
+                for users in split_every(batch_size, review_ids_by_user)
+            ]
+            # Reviews without reviewers are only marked as reminded
+            orphan_ids = set(review_ids).difference(*review_ids_by_user.values())
+            if orphan_ids:
+                batches.append(((), sorted(orphan_ids)))
+        else:
+            batches = [(None, ids) for ids in split_every(batch_size, review_ids)]
+        start = time.monotonic()
+        done_ids = set()
+        for users, batch_ids in batches:
+            reviews = Review.browse(batch_ids).filtered(
+                lambda r: r.status in ("waiting", "pending")
+            )
+            if users is None:
+                reviews._send_review_reminder()
+            else:
+                reviews._send_review_reminder_digest(reviewers=users)
+            done_ids.update(batch_ids)
+            if not modules.module.current_test:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
+            if time.monotonic() - start > time_budget:
+                break
+        self.env["ir.cron"]._notify_progress(
+            done=len(done_ids), remaining=len(review_ids) - len(done_ids)
         )
-        for record in definition_with_reminder:
-            review_to_remind = record._get_review_needing_reminder()
-            if review_to_remind:
-                review_to_remind._send_review_reminder()
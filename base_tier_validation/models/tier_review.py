@@ -2,11 +2,13 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
 import logging
+from collections import defaultdict
 
 import pytz
 
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
 
 _logger = logging.getLogger(__name__)
 
@@ -69,6 +71,120 @@ class TierReview(models.Model):
     )
     last_reminder_date = fields.Datetime(readonly=True)
 
+    def init(self):
+        tools.create_index(
+            self.env.cr,
+            "tier_review_open_reminder_index",
+            self._table,
+            ["definition_id", "COALESCE(last_reminder_date, create_date)"],
+            where="status IN ('waiting', 'pending')",
+        )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        reviews = super().create(vals_list)
+        self.env["tier.review.pending"]._mark_dirty(reviews._get_review_documents())
+        return reviews
+
+    def write(self, vals):
+        if {"status", "sequence", "definition_id"}.intersection(vals):
+            self.env["tier.review.pending"]._mark_dirty(self._get_review_documents())
+        return super().write(vals)
+
+    def unlink(self):
+        self.env["tier.review.pending"]._mark_dirty(self._get_review_documents())
+        return super().unlink()
+
+    def _get_review_documents(self):
+        return {(review.model, review.res_id) for review in self if review.res_id}
+
+    @api.model
+    def _get_pending_reviewers(self, documents):
+        """Return the ids of the users having a pending review they can act
+        on, for each of the given ``(model, res_id)`` documents, as stored in
+        the pending reviewers table. Documents with a rejected review are
+        left out, as in the systray counter."""
+        Pending = self.env["tier.review.pending"]
+        res_ids_by_model = defaultdict(list)
+        for model, res_id in documents:
+            res_ids_by_model[model].append(res_id)
+        result = defaultdict(set)
+        for model, res_ids in res_ids_by_model.items():
+            rows = self.env.execute_query(
+                SQL(
+                    """
+                    SELECT pending.res_id, pending.user_id
+                    FROM %(pending_table)s pending
+                    WHERE pending.model = %(model)s
+                        AND pending.res_id = ANY(%(res_ids)s)
+                        AND NOT EXISTS (
+                            SELECT 1 FROM tier_review rejected
+                            WHERE rejected.model = pending.model
+                                AND rejected.res_id = pending.res_id
+                                AND rejected.status = 'rejected'
+                        )
+                    """,
+                    pending_table=SQL.identifier(Pending._table),
+                    model=model,
+                    res_ids=res_ids,
+                )
+            )
+            for res_id, user_id in rows:
+                result[(model, res_id)].add(user_id)
+        return result
+
+    def _snapshot_pending_reviewers(self, documents):
+        """Remember the pending reviewers of ``documents`` as they were before
+        their first review change in the transaction. The counters of the
+        reviewers are updated from this snapshot right before the commit.
+
+        Called when the documents are marked as dirty in the pending
+        reviewers table, so their rows still hold the previous state."""
+        data = self.env.cr.precommit.data
+        snapshot = data.get("tier.review.pending_reviewers")
+        if snapshot is None:
+            snapshot = data["tier.review.pending_reviewers"] = {}
+            hook = self.browse()._notify_pending_reviewers_changes
+            self.env.cr.precommit.add(hook)
+        missing = [document for document in documents if document not in snapshot]
+        if missing:
+            before = self._get_pending_reviewers(missing)
+            for document in missing:
+                snapshot[document] = before.get(document, set())
+
+    @api.model
+    def _get_pending_count_deltas(self, snapshot):
+        """Return ``{user_id: {model: delta}}`` between the pending reviewers
+        of ``snapshot`` and the current ones, the pending reviewers table
+        being refreshed."""
+        after = self._get_pending_reviewers(snapshot)
+        deltas = defaultdict(lambda: defaultdict(int))
+        for (model, res_id), before_ids in snapshot.items():
+            after_ids = after.get((model, res_id), set())
+            for user_id in after_ids - before_ids:
+                deltas[user_id][model] += 1
+            for user_id in before_ids - after_ids:
+                deltas[user_id][model] -= 1
+        return {
+            user_id: {model: delta for model, delta in counts.items() if delta}
+            for user_id, counts in deltas.items()
+            if any(counts.values())
+        }
+
+    def _notify_pending_reviewers_changes(self):
+        """Send the reviewers whose pending reviews changed their systray
+        counters, counted under their own access rights as when the systray
+        fetches them."""
+        self.env["tier.review.pending"]._refresh_dirty()
+        snapshot = self.env.cr.precommit.data.pop("tier.review.pending_reviewers", {})
+        deltas = self.sudo()._get_pending_count_deltas(snapshot)
+        if not deltas:
+            return
+        channel = "base.tier.validation/updated"
+        for user in self.env["res.users"].sudo().browse(list(deltas)):
+            counters = self.env["res.users"].with_user(user)._get_review_user_counters()
+            user.partner_id._bus_send(channel, {"groups": counters})
+
     @api.depends("status")
     def _compute_display_status(self):
         """
@@ -93,45 +209,187 @@ class TierReview(models.Model):
 
     @api.depends("definition_id.approve_sequence")
     def _compute_can_review(self):
-        reviews = self.filtered(lambda rev: rev.status in ["waiting", "pending"])
-        if reviews:
-            # get minimum sequence of all to prevent jumps
-            next_seq = min(reviews.mapped("sequence"))
-            for record in reviews:
-                # if approve by sequence, check sequence has been reached
-                if record.approve_sequence:
-                    if record.sequence == next_seq:
-                        record.status = "pending"
-                # if there is no approval sequence go directly to pending state
-                elif not record.approve_sequence:
-                    record.status = "pending"
-                if record.status == "pending":
-                    if record.definition_id.notify_on_pending:
-                        record._notify_pending_status(record)
+        self.env["tier.review.pending"]._mark_dirty(self._get_review_documents())
+        min_open_sequences = self._get_min_open_sequences()
+        for document, reviews in self.grouped(lambda r: (r.model, r.res_id)).items():
+            reviews._update_pending_status(min_open_sequences.get(document))
+        pending_sequences = self._get_pending_sequences()
         for record in self:
-            record.can_review = record._can_review_value()
+            record.can_review = record._can_review_value(
+                pending_sequences.get((record.model, record.res_id), [])
+            )
+
+    def _update_pending_status(self, next_seq=None):
+        """Move the open reviews of a single document to pending when their
+        turn has come, in a single write. ``next_seq`` is the lowest open
+        sequence among all the reviews of the document."""
+        reviews = self.filtered(lambda rev: rev.status in ["waiting", "pending"])
+        if not reviews:
+            return
+        # get minimum sequence of the document to prevent jumps
+        sequences = reviews.mapped("sequence")
+        if next_seq is None:
+            next_seq = min(
+                reviews._get_min_open_sequences().values(), default=min(sequences)
+            )
+        next_seq = min(next_seq, *sequences)
+        # if there is no approval sequence go directly to pending state,
+        # otherwise check sequence has been reached
+        to_pending = reviews.filtered(
+            lambda r: r.status == "waiting"
+            and (not r.approve_sequence or r.sequence == next_seq)
+        )
+        if to_pending:
+            to_pending.status = "pending"
+        for record in reviews.filtered(
+            lambda r: r.status == "pending" and r.definition_id.notify_on_pending
+        ):
+            record._notify_pending_status(record)
+
+    def _get_min_open_sequences(self):
+        """Return the lowest sequence of the open reviews of the documents of
+        ``self``, by ``(model, res_id)``, reading the reviews once per model."""
+        res_ids_by_model = defaultdict(set)
+        for model, res_id in self._get_review_documents():
+            res_ids_by_model[model].add(res_id)
+        min_sequences = {}
+        for model, res_ids in res_ids_by_model.items():
+            groups = self._read_group(
+                [
+                    ("model", "=", model),
+                    ("res_id", "in", list(res_ids)),
+                    ("status", "in", ("waiting", "pending")),
+                ],
+                ["res_id"],
+                ["sequence:min"],
+            )
+            for res_id, sequence in groups:
+                min_sequences[(model, res_id)] = sequence
+        return min_sequences
+
+    def _get_pending_sequences(self):
+        """Return the sequences of the pending reviews of the documents of
+        ``self``, by ``(model, res_id)``, reading the reviews once per model."""
+        res_ids_by_model = defaultdict(set)
+        for model, res_id in self._get_review_documents():
+            res_ids_by_model[model].add(res_id)
+        pending_sequences = defaultdict(list)
+        for model, res_ids in res_ids_by_model.items():
+            pending_reviews = self.search(
+                [
+                    ("model", "=", model),
+                    ("res_id", "in", list(res_ids)),
+                    ("status", "=", "pending"),
+                ]
+            )
+            for review in pending_reviews:
+                pending_sequences[(review.model, review.res_id)].append(
+                    review.sequence
+                )
+        return pending_sequences
 
-    def _can_review_value(self):
+    def _can_review_value(self, pending_sequences=None):
         if self.status not in ("pending", "waiting"):
             return False
         if not self.approve_sequence:
             return True
-        resource = self.env[self.model].browse(self.res_id)
-        reviews = resource.review_ids.filtered(lambda r: r.status == "pending")
-        if not reviews:
+        if pending_sequences is None:
+            resource = self.env[self.model].browse(self.res_id)
+            pending_sequences = resource.review_ids.filtered(
+                lambda r: r.status == "pending"
+            ).mapped("sequence")
+        if not pending_sequences:
             return True
-        sequence = min(reviews.mapped("sequence"))
-        return self.sequence == sequence
+        return self.sequence == min(pending_sequences)
 
     @api.model
     def _get_reviewer_fields(self):
-        return ["reviewer_id", "reviewer_group_id", "reviewer_group_id.users"]
+        # The members of reviewer_group_id are not a dependency: a change in a
+        # group would recompute every review of the group ever made. See
+        # _recompute_group_reviewers.
+        return ["reviewer_id", "reviewer_group_id"]
 
     @api.depends(lambda self: self._get_reviewer_fields())
     def _compute_reviewer_ids(self):
+        self.env["tier.review.pending"]._mark_dirty(self._get_review_documents())
         for rec in self:
+            # The reviewers of closed reviews are frozen
+            if rec.status not in ("waiting", "pending"):
+                continue
             rec.reviewer_ids = rec._get_reviewers()
 
+    @api.model
+    def _recompute_group_reviewers(self, groups):
+        """Recompute the reviewers of the open reviews of ``groups`` after a
+        change of their members."""
+        if not groups:
+            return
+        reviews = (
+            self.sudo()
+            .with_context(active_test=False)
+            .search(
+                [
+                    ("reviewer_group_id", "in", groups.ids),
+                    ("status", "in", ("waiting", "pending")),
+                ]
+            )
+        )
+        if reviews:
+            self.env.add_to_compute(self._fields["reviewer_ids"], reviews)
+            self.env.add_to_compute(self._fields["todo_by"], reviews)
+
+    @api.model
+    def _report_reviewer_fan_out(self):
+        """Maintenance command, to be run from a shell: report, per reviewer
+        group, how many reviews depend on the members of the group and how
+        many reviewer rows they hold.
+
+        Nothing is changed: the reviewers of the closed reviews are frozen
+        and kept as the record of who could review them.
+        """
+        self.flush_model(["status", "definition_id", "reviewer_ids"])
+        self.env["tier.definition"].flush_model(["reviewer_group_id"])
+        reviewer_field = self._fields["reviewer_ids"]
+        # base_tier_validation_forward stores reviewer_group_id on the review
+        if self._fields["reviewer_group_id"].store:
+            group_column = SQL.identifier("review", "reviewer_group_id")
+        else:
+            group_column = SQL.identifier("definition", "reviewer_group_id")
+        rows = self.env.execute_query_dict(
+            SQL(
+                """
+                SELECT %(group_column)s AS group_id,
+                       COUNT(DISTINCT review.id) FILTER (
+                           WHERE review.status IN ('waiting', 'pending')
+                       ) AS open_reviews,
+                       COUNT(DISTINCT review.id) FILTER (
+                           WHERE review.status NOT IN ('waiting', 'pending')
+                       ) AS closed_reviews,
+                       COUNT(rel.%(review_column)s) FILTER (
+                           WHERE review.status NOT IN ('waiting', 'pending')
+                       ) AS closed_reviewer_rows
+                  FROM tier_review review
+             LEFT JOIN tier_definition definition
+                    ON definition.id = review.definition_id
+             LEFT JOIN %(relation)s rel ON rel.%(review_column)s = review.id
+                 WHERE %(group_column)s IS NOT NULL
+              GROUP BY %(group_column)s
+              ORDER BY closed_reviewer_rows DESC
+                """,
+                group_column=group_column,
+                relation=SQL.identifier(reviewer_field.relation),
+                review_column=SQL.identifier(reviewer_field.column1),
+            )
+        )
+        for row in rows:
+            _logger.info(
+                "Reviewer group %(group_id)s: %(open_reviews)s open reviews, "
+                "%(closed_reviews)s closed reviews holding "
+                "%(closed_reviewer_rows)s reviewer rows",
+                row,
+            )
+        return rows
+
     @api.depends("reviewer_ids")
     def _compute_todo_by(self):
         """Show by group or by abbrev list of names"""
@@ -175,17 +433,78 @@ class TierReview(models.Model):
         delay = (fields.Datetime.now() - self.create_date).days
         return self.env._("A review has been requested %s days ago.", delay)
 
+    @api.model
+    def _is_reminder_digest_enabled(self):
+        return bool(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param("base_tier_validation.reminder_digest")
+        )
+
+    def _get_reminder_digest_lines(self):
+        now = fields.Datetime.now()
+        lines = []
+        for review in self:
+            record = self.env[review.model].sudo().browse(review.res_id)
+            lines.append(
+                {
+                    "document": record.display_name,
+                    "name": review.name or "",
+                    "delay": (now - review.create_date).days,
+                    "url": f"/mail/view?model={review.model}&res_id={review.res_id}",
+                }
+            )
+        return lines
+
+    def _get_review_ids_by_reviewer(self):
+        review_ids_by_user = defaultdict(list)
+        for review in self:
+            for user in review.reviewer_ids:
+                review_ids_by_user[user].append(review.id)
+        return review_ids_by_user
+
+    def _send_review_reminder_digest(self, reviewers=None):
+        """Send each reviewer a single message listing all its reviews of
+        ``self``, only to ``reviewers`` when given."""
+        for user, review_ids in self._get_review_ids_by_reviewer().items():
+            if reviewers is not None and user not in reviewers:
+                continue
+            reviews = self.browse(review_ids)
+            body = self.env["ir.qweb"]._render(
+                "base_tier_validation.tier_review_reminder_digest",
+                {"lines": reviews._get_reminder_digest_lines()},
+            )
+            self.env["mail.thread"].message_notify(
+                partner_ids=user.partner_id.ids,
+                subject=self.env._(
+                    "%s documents waiting for your review", len(reviews)
+                ),
+                body=body,
+            )
+        self.write({"last_reminder_date": fields.Datetime.now()})
+
     def _send_review_reminder(self):
-        record = self.env[self.model].browse(self.res_id)
-        # Only schedule activity if reviewer is a single user and model has activities
-        if len(self.reviewer_ids) == 1 and hasattr(record, "activity_ids"):
-            self._schedule_review_reminder_activity(record)
-        elif hasattr(record, "message_post"):
-            self._notify_review_reminder(record)
-        else:
-            msg = f"Could not send reminder for record {record}"
-            _logger.exception(msg)
-        self.last_reminder_date = fields.Datetime.now()
+        if self._is_reminder_digest_enabled():
+            return self._send_review_reminder_digest()
+        res_ids_by_model = defaultdict(list)
+        for review in self:
+            res_ids_by_model[review.model].append(review.res_id)
+        for review in self:
+            record = (
+                self.env[review.model]
+                .browse(review.res_id)
+                .with_prefetch(res_ids_by_model[review.model])
+            )
+            # Only schedule activity if reviewer is a single user and model
+            # has activities
+            if len(review.reviewer_ids) == 1 and hasattr(record, "activity_ids"):
+                review._schedule_review_reminder_activity(record)
+            elif hasattr(record, "message_post"):
+                review._notify_review_reminder(record)
+            else:
+                msg = f"Could not send reminder for record {record}"
+                _logger.exception(msg)
+        self.write({"last_reminder_date": fields.Datetime.now()})
 
     def _notify_review_reminder(self, record):
         record.message_post(
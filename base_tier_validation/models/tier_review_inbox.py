@@ -0,0 +1,128 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from collections import defaultdict
+
+from odoo import api, fields, models, tools
+from odoo.tools import SQL
+
+
+class TierReviewInbox(models.Model):
+    """Documents waiting for a review of the user, across all the models under
+    tier validation, oldest request first."""
+
+    _name = "tier.review.inbox"
+    _description = "Tier Review Inbox"
+    _auto = False
+    _order = "request_date, review_id"
+    _rec_name = "document_name"
+
+    user_id = fields.Many2one(comodel_name="res.users", readonly=True)
+    model = fields.Char(string="Related Document Model", readonly=True)
+    res_id = fields.Many2oneReference(
+        string="Related Document ID", model_field="model", readonly=True
+    )
+    review_id = fields.Many2one(comodel_name="tier.review", readonly=True)
+    definition_id = fields.Many2one(comodel_name="tier.definition", readonly=True)
+    name = fields.Char(related="definition_id.name")
+    sequence = fields.Integer(string="Tier", readonly=True)
+    requested_by = fields.Many2one(comodel_name="res.users", readonly=True)
+    request_date = fields.Datetime(readonly=True)
+    company_id = fields.Many2one(comodel_name="res.company", readonly=True)
+    age = fields.Integer(string="Age (days)", compute="_compute_age")
+    document_name = fields.Char(compute="_compute_document_values")
+    model_description = fields.Char(
+        string="Document Type", compute="_compute_document_values"
+    )
+    amount = fields.Monetary(compute="_compute_document_values")
+    currency_id = fields.Many2one(
+        comodel_name="res.currency", compute="_compute_document_values"
+    )
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(
+            SQL(
+                """
+                CREATE OR REPLACE VIEW %(table)s AS (
+                    SELECT pending.id,
+                           pending.user_id,
+                           pending.model,
+                           pending.res_id,
+                           pending.review_id,
+                           pending.sequence,
+                           review.definition_id,
+                           review.requested_by,
+                           review.create_date AS request_date,
+                           review.company_id
+                      FROM tier_review_pending pending
+                      JOIN tier_review review ON review.id = pending.review_id
+                )
+                """,
+                table=SQL.identifier(self._table),
+            )
+        )
+
+    @api.model
+    def _search(self, domain, *args, **kwargs):
+        self.env["tier.review.pending"]._refresh_dirty()
+        return super()._search(domain, *args, **kwargs)
+
+    def _compute_age(self):
+        now = fields.Datetime.now()
+        for inbox in self:
+            inbox.age = (now - inbox.request_date).days if inbox.request_date else 0
+
+    def _compute_document_values(self):
+        inboxes_by_model = defaultdict(lambda: self.browse())
+        for inbox in self:
+            inboxes_by_model[inbox.model] |= inbox
+        for model, inboxes in inboxes_by_model.items():
+            if model not in self.env:
+                inboxes.document_name = False
+                inboxes.model_description = False
+                inboxes.amount = 0.0
+                inboxes.currency_id = False
+                continue
+            Model = self.env[model].sudo().with_context(active_test=False)
+            documents = Model.browse(inboxes.mapped("res_id"))
+            amount_field = Model._tier_validation_amount_field
+            for inbox in inboxes:
+                document = Model.browse(inbox.res_id).with_prefetch(
+                    documents._prefetch_ids
+                )
+                inbox.document_name = document.display_name
+                inbox.model_description = Model._description
+                inbox.amount = document[amount_field] if amount_field else 0.0
+                if "currency_id" in Model._fields:
+                    inbox.currency_id = document.currency_id
+                else:
+                    inbox.currency_id = (
+                        inbox.company_id.currency_id or self.env.company.currency_id
+                    )
+
+    def _get_document(self):
+        self.ensure_one()
+        return self.env[self.model].browse(self.res_id)
+
+    def _action_review(self, method):
+        for inbox in self:
+            res = getattr(inbox._get_document(), method)()
+            # A comment is required before the review is done
+            if isinstance(res, dict):
+                return res
+        return True
+
+    def action_validate_tier(self):
+        return self._action_review("validate_tier")
+
+    def action_reject_tier(self):
+        return self._action_review("reject_tier")
+
+    def action_open_document(self):
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_window",
+            "res_model": self.model,
+            "res_id": self.res_id,
+            "views": [(False, "form")],
+        }
@@ -0,0 +1,227 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from collections import defaultdict
+
+from odoo import api, fields, models, tools
+from odoo.tools import SQL
+
+DIRTY_KEY = "tier.review.pending.dirty"
+
+
+class TierReviewPending(models.Model):
+    """Reviews that can be acted on right now, one row per reviewer.
+
+    The rows are derived from tier.review: the documents whose reviews change
+    are marked as dirty and their rows are synchronized before the table is
+    read and before the transaction is committed. A row keeps its id for as
+    long as its user can act on its review.
+    """
+
+    _name = "tier.review.pending"
+    _description = "Tier Review Pending Reviewer"
+    _log_access = False
+
+    user_id = fields.Many2one(
+        comodel_name="res.users", required=True, ondelete="cascade"
+    )
+    model = fields.Char(required=True)
+    res_id = fields.Many2oneReference(required=True, model_field="model")
+    review_id = fields.Many2one(
+        comodel_name="tier.review", required=True, ondelete="cascade", index=True
+    )
+    sequence = fields.Integer()
+
+    def init(self):
+        # A single row per user and review, kept while the review is pending
+        tools.create_unique_index(
+            self.env.cr,
+            "tier_review_pending_user_review_uniq",
+            self._table,
+            ["user_id", "review_id"],
+        )
+        tools.create_index(
+            self.env.cr,
+            "tier_review_pending_user_model_res_id_index",
+            self._table,
+            ["user_id", "model", "res_id"],
+        )
+        tools.create_index(
+            self.env.cr,
+            "tier_review_pending_model_res_id_index",
+            self._table,
+            ["model", "res_id"],
+        )
+
+    @api.model
+    def _mark_dirty(self, documents):
+        """Schedule the rebuild of the rows of the ``(model, res_id)``
+        documents."""
+        if not documents:
+            return
+        self.env["tier.review"]._snapshot_pending_reviewers(documents)
+        data = self.env.cr.precommit.data
+        dirty = data.get(DIRTY_KEY)
+        if dirty is None:
+            dirty = data[DIRTY_KEY] = set()
+            self.env.cr.precommit.add(self.browse()._refresh_dirty)
+        dirty.update(documents)
+
+    @api.model
+    def _refresh_dirty(self):
+        """Rebuild the rows of the documents marked as dirty. Must be called
+        before reading the table."""
+        while True:
+            # Flushing runs the pending computations of the reviews, which
+            # may mark more documents as dirty: flush before taking them.
+            self._flush_reviews()
+            dirty = self.env.cr.precommit.data.get(DIRTY_KEY)
+            if not dirty:
+                return
+            documents = set(dirty)
+            dirty.clear()
+            self._rebuild_documents(documents)
+
+    @api.model
+    def _rebuild_documents(self, documents):
+        res_ids_by_model = defaultdict(list)
+        for model, res_id in documents:
+            res_ids_by_model[model].append(res_id)
+        for model, res_ids in res_ids_by_model.items():
+            self._sync_pending_reviews(
+                SQL(
+                    "review.model = %s AND review.res_id = ANY(%s)",
+                    model,
+                    sorted(res_ids),
+                ),
+                SQL("model = %s AND res_id = ANY(%s)", model, sorted(res_ids)),
+            )
+
+    @api.model
+    def _rebuild(self):
+        """Rebuild the whole table from the open reviews."""
+        self.env.cr.precommit.data.pop(DIRTY_KEY, None)
+        self._flush_reviews()
+        self._sync_pending_reviews(SQL("TRUE"), SQL("TRUE"))
+
+    @api.model
+    def _flush_reviews(self):
+        self.env["tier.review"].flush_model(
+            [
+                "model",
+                "res_id",
+                "status",
+                "sequence",
+                "definition_id",
+                "reviewer_ids",
+                "can_review",
+                "approve_sequence",
+            ]
+        )
+        self.env["tier.definition"].flush_model(["approve_sequence"])
+
+    @api.model
+    def _sync_pending_reviews(self, condition, table_condition):
+        """Make the rows matching ``table_condition`` match the pending
+        reviews of the reviews matching ``condition`` on ``review``.
+
+        Rows still pending are kept as they are, so that the id of a row is
+        stable for as long as its user can act on its review.
+        """
+        pending_reviews = self._get_pending_reviews_query(condition)
+        self.env.cr.execute(
+            SQL(
+                """
+                DELETE FROM %(table)s existing
+                 WHERE %(table_condition)s
+                   AND NOT EXISTS (
+                        SELECT 1
+                          FROM (%(pending_reviews)s) fresh
+                         WHERE fresh.user_id = existing.user_id
+                           AND fresh.review_id = existing.review_id
+                   )
+                """,
+                table=SQL.identifier(self._table),
+                table_condition=table_condition,
+                pending_reviews=pending_reviews,
+            )
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO %(table)s (user_id, model, res_id, review_id, sequence)
+                %(pending_reviews)s
+                ON CONFLICT (user_id, review_id)
+                DO UPDATE SET sequence = EXCLUDED.sequence
+                """,
+                table=SQL.identifier(self._table),
+                pending_reviews=pending_reviews,
+            )
+        )
+
+    @api.model
+    def _get_pending_reviews_query(self, condition):
+        """Query of the reviewers of the open reviews matching ``condition``
+        on ``review`` who can act on them: reviews ignoring the approval
+        sequence and reviews sitting on the lowest open sequence of their
+        document, as long as a review of the document can be reviewed."""
+        Review = self.env["tier.review"]
+        reviewer_field = Review._fields["reviewer_ids"]
+        # base_tier_validation_forward stores approve_sequence on the review
+        if Review._fields["approve_sequence"].store:
+            approve_sequence = SQL.identifier("review", "approve_sequence")
+        else:
+            approve_sequence = SQL.identifier("definition", "approve_sequence")
+        return SQL(
+            """
+            SELECT reviewer_rel.%(user_column)s AS user_id,
+                   review.model AS model,
+                   review.res_id AS res_id,
+                   review.id AS review_id,
+                   review.sequence AS sequence
+              FROM tier_review review
+              JOIN %(reviewer_rel)s reviewer_rel
+                ON reviewer_rel.%(review_column)s = review.id
+         LEFT JOIN tier_definition definition
+                ON definition.id = review.definition_id
+             WHERE %(condition)s
+               AND review.res_id IS NOT NULL
+               AND review.status IN ('waiting', 'pending')
+               AND (
+                    NOT COALESCE(%(approve_sequence)s, FALSE)
+                    OR review.sequence <= (
+                        SELECT MIN(open_review.sequence)
+                          FROM tier_review open_review
+                         WHERE open_review.model = review.model
+                           AND open_review.res_id = review.res_id
+                           AND open_review.status IN ('waiting', 'pending')
+                    )
+               )
+               AND EXISTS (
+                    SELECT 1
+                      FROM tier_review reviewable
+                     WHERE reviewable.model = review.model
+                       AND reviewable.res_id = review.res_id
+                       AND reviewable.can_review
+               )
+            """,
+            reviewer_rel=SQL.identifier(reviewer_field.relation),
+            review_column=SQL.identifier(reviewer_field.column1),
+            user_column=SQL.identifier(reviewer_field.column2),
+            approve_sequence=approve_sequence,
+            condition=condition,
+        )
+
+    @api.model
+    def _get_res_ids_query(self, model, user_ids=None):
+        """Subquery of the ids of the ``model`` documents that one of
+        ``user_ids``, or anyone when not given, can review."""
+        self._refresh_dirty()
+        user_condition = SQL("TRUE")
+        if user_ids is not None:
+            user_condition = SQL("user_id = ANY(%s)", list(user_ids))
+        return SQL(
+            "(SELECT res_id FROM %s WHERE model = %s AND %s)",
+            SQL.identifier(self._table),
+            model,
+            user_condition,
+        )
@@ -2,14 +2,15 @@
 # Copyright 2024 Moduon Team (https://www.moduon.team)
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from ast import literal_eval
+from collections import defaultdict
 
 from lxml import etree
 from psycopg2.extensions import AsIs
 
 from odoo import api, fields, models
 from odoo.exceptions import ValidationError
-from odoo.tools import SQL
+from odoo.osv import expression
+from odoo.tools import SQL, split_every, sql
 from odoo.tools.misc import frozendict
 
 BASE_EXCEPTION_FIELDS = [
@@ -27,6 +28,7 @@ class TierValidation(models.AbstractModel):
     _tier_validation_manual_config = True
     _tier_validation_state_field_is_computed = False
     _tier_validation_company_field = "company_id"
+    _tier_validation_amount_field = False
 
     _state_field = "state"
     _state_from = ["draft"]
@@ -67,73 +69,111 @@ class TierValidation(models.AbstractModel):
     reviewer_ids = fields.Many2many(
         string="Reviewers",
         comodel_name="res.users",
-        compute="_compute_reviewer_ids",
+        compute="_compute_review_values",
         search="_search_reviewer_ids",
     )
     can_review = fields.Boolean(
-        compute="_compute_can_review", search="_search_can_review"
+        compute="_compute_review_values", search="_search_can_review"
     )
     has_comment = fields.Boolean(
-        compute="_compute_has_comment",
+        compute="_compute_review_values",
         help="If set, Allow the reviewer to leave a comment on the review.",
     )
-    next_review = fields.Char(compute="_compute_next_review")
+    next_review = fields.Char(compute="_compute_review_values")
     hide_reviews = fields.Boolean(compute="_compute_hide_reviews")
 
-    def _compute_has_comment(self):
+    def _get_review_index(self):
+        """Index the reviews of each record in a single pass.
+
+        Returns a dict keyed by record id holding the open (waiting or
+        pending) reviews sorted by sequence along with their reviewer ids,
+        the lowest open sequence, the first pending review, the set of
+        review statuses and the reviewers of all open reviews.
+        """
+        index = {}
         for rec in self:
-            has_comment = rec.review_ids.filtered(
-                lambda r: r.status in ("waiting", "pending")
-                and self.env.user in r.reviewer_ids
-            ).mapped("has_comment")
-            rec.has_comment = True in has_comment
+            open_reviews = []
+            next_review = self.env["tier.review"]
+            statuses = set()
+            for review in rec.review_ids.sorted("sequence"):
+                statuses.add(review.status)
+                if review.status not in ("waiting", "pending"):
+                    continue
+                open_reviews.append((review, set(review.reviewer_ids.ids)))
+                if review.status == "pending" and not next_review:
+                    next_review = review
+            index[rec.id] = {
+                "open_reviews": open_reviews,
+                "min_sequence": open_reviews[0][0].sequence if open_reviews else 0,
+                "next_review": next_review,
+                "statuses": statuses,
+                "reviewer_ids": set().union(
+                    *(reviewer_ids for __, reviewer_ids in open_reviews)
+                ),
+            }
+        return index
 
-    def _get_sequences_to_approve(self, user):
-        all_reviews = self.review_ids.filtered(
-            lambda r: r.status in ("waiting", "pending")
-        )
-        my_reviews = all_reviews.filtered(lambda r: user in r.reviewer_ids)
+    @api.model
+    def _get_indexed_sequences_to_approve(self, entry, user):
+        my_reviews = [
+            review
+            for review, reviewer_ids in entry["open_reviews"]
+            if user.id in reviewer_ids
+        ]
         # Include all my_reviews with approve_sequence = False
-        sequences = my_reviews.filtered(lambda r: not r.approve_sequence).mapped(
-            "sequence"
-        )
+        sequences = [r.sequence for r in my_reviews if not r.approve_sequence]
         # Include only my_reviews with approve_sequence = True
-        approve_sequences = my_reviews.filtered("approve_sequence").mapped("sequence")
+        approve_sequences = [r.sequence for r in my_reviews if r.approve_sequence]
         if approve_sequences:
             my_sequence = min(approve_sequences)
-            min_sequence = min(all_reviews.mapped("sequence"))
-            if my_sequence <= min_sequence:
+            if my_sequence <= entry["min_sequence"]:
                 sequences.append(my_sequence)
         return sequences
 
-    def _compute_can_review(self):
+    def _get_sequences_to_approve(self, user):
+        sequences = []
+        for entry in self._get_review_index().values():
+            sequences += self._get_indexed_sequences_to_approve(entry, user)
+        return sequences
+
+    @api.depends("review_ids")
+    @api.depends_context("uid")
+    def _compute_review_values(self):
+        """Compute the fields derived from the open reviews together, so that
+        the reviews of the records are indexed once."""
+        index = self._get_review_index()
+        user = self.env.user
         for rec in self:
-            rec.can_review = rec._get_sequences_to_approve(self.env.user)
+            entry = index[rec.id]
+            rec.can_review = bool(self._get_indexed_sequences_to_approve(entry, user))
+            rec.reviewer_ids = self.env["res.users"].browse(
+                sorted(entry["reviewer_ids"])
+            )
+            rec.has_comment = any(
+                review.has_comment
+                for review, reviewer_ids in entry["open_reviews"]
+                if user.id in reviewer_ids
+            )
+            review = entry["next_review"]
+            rec.next_review = review and self.env._("Next: %s", review.name or "")
 
     @api.model
     def _search_can_review(self, operator, value):
-        domain = [
-            ("review_ids.reviewer_ids", "=", self.env.user.id),
-            ("review_ids.status", "in", ["pending", "waiting"]),
-            ("review_ids.can_review", "=", True),
-            ("rejected", "=", False),
-        ]
-        if "active" in self._fields:
-            domain.append(("active", "in", [True, False]))
-        res_ids = self.search(domain).filtered("can_review").ids
-        return [("id", "in", res_ids)]
-
-    @api.depends("review_ids")
-    def _compute_reviewer_ids(self):
-        for rec in self:
-            rec.reviewer_ids = rec.review_ids.filtered(
-                lambda r: r.status in ("waiting", "pending")
-            ).mapped("reviewer_ids")
+        """Same rule as ``_get_sequences_to_approve``, read from the pending
+        reviewers table: an open review of the current user either ignores
+        the approval sequence or sits on the lowest open sequence of its
+        document."""
+        can_review_query = self.env["tier.review.pending"]._get_res_ids_query(
+            self._name, [self.env.uid]
+        )
+        return [("id", "in", can_review_query), ("rejected", "=", False)]
 
     @api.model
     def _search_validated(self, operator, value):
         assert operator in ("=", "!="), "Invalid domain operator"
         assert value in (True, False), "Invalid domain value"
+        if self._fields["validation_status"].store:
+            return self._search_stored_validation_status("validated", value)
         pos = self.search([(self._state_field, "in", self._state_from)]).filtered(
             lambda r: r.validated
         )
@@ -146,6 +186,8 @@ class TierValidation(models.AbstractModel):
     def _search_rejected(self, operator, value):
         assert operator in ("=", "!="), "Invalid domain operator"
         assert value in (True, False), "Invalid domain value"
+        if self._fields["validation_status"].store:
+            return self._search_stored_validation_status("rejected", value)
         pos = self.search([(self._state_field, "in", self._state_from)]).filtered(
             lambda r: r.rejected
         )
@@ -154,22 +196,46 @@ class TierValidation(models.AbstractModel):
         else:
             return [("id", "not in", pos.ids)]
 
+    @api.model
+    def _search_stored_validation_status(self, status, value):
+        """Domain on the stored validation_status column matching the
+        documents in ``_state_from`` with the given status."""
+        if value:
+            return [
+                (self._state_field, "in", self._state_from),
+                ("validation_status", "=", status),
+            ]
+        return [
+            "|",
+            (self._state_field, "not in", self._state_from),
+            ("validation_status", "!=", status),
+        ]
+
     @api.model
     def _search_reviewer_ids(self, operator, value):
+        """Records with a review of the given reviewers that can be reviewed,
+        following the ``can_review`` of each review."""
         model_operator = "in"
         if operator == "=" and value in ("[]", False):
             # Search for records that have not yet been through a validation
             # process.
             operator = "!="
             model_operator = "not in"
-        reviews = self.env["tier.review"].search(
+        Review = self.env["tier.review"]
+        reviews_query = Review._search(
             [
                 ("model", "=", self._name),
                 ("reviewer_ids", operator, value),
                 ("can_review", "=", True),
             ]
         )
-        return [("id", model_operator, list(set(reviews.mapped("res_id"))))]
+        return [
+            (
+                "id",
+                model_operator,
+                reviews_query.subselect(SQL.identifier(Review._table, "res_id")),
+            )
+        ]
 
     def _get_to_validate_message_name(self):
         return self._description
@@ -200,33 +266,79 @@ class TierValidation(models.AbstractModel):
             rec.rejected_message = rec._get_rejected_message()
             rec.to_validate_message = rec._get_to_validate_message()
 
+    @api.model
+    def _get_validation_status_depends(self):
+        """Only a stored validation_status has to follow review changes."""
+        if self._fields["validation_status"].store:
+            return ["review_ids.status"]
+        return []
+
+    @api.depends(lambda self: self._get_validation_status_depends())
     def _compute_validation_status(self):
+        index = self._get_review_index()
         for item in self:
-            if item.validated and not item.rejected:
+            validated = self._calc_reviews_validated(item.review_ids)
+            rejected = self._calc_reviews_rejected(item.review_ids)
+            statuses = index[item.id]["statuses"]
+            if validated and not rejected:
                 item.validation_status = "validated"
-            elif not item.validated and item.rejected:
+            elif not validated and rejected:
                 item.validation_status = "rejected"
-            elif (
-                not item.validated
-                and not item.rejected
-                and any(item.review_ids.filtered(lambda x: x.status == "pending"))
-            ):
+            elif not validated and not rejected and "pending" in statuses:
                 item.validation_status = "pending"
-            elif (
-                not item.validated
-                and not item.rejected
-                and any(item.review_ids.filtered(lambda x: x.status == "waiting"))
-            ):
+            elif not validated and not rejected and "waiting" in statuses:
                 item.validation_status = "waiting"
             else:
                 item.validation_status = "no"
 
-    def _compute_next_review(self):
-        for rec in self:
-            review = rec.review_ids.sorted("sequence").filtered(
-                lambda x: x.status == "pending"
-            )[:1]
-            rec.next_review = review and self.env._("Next: %s", review.name or "")
+    def _auto_init(self):
+        """Create the stored validation_status column ourselves so that the
+        existing documents are backfilled by batches instead of all at once."""
+        field = self._fields.get("validation_status")
+        cr = self.env.cr
+        if (
+            self._auto
+            and field
+            and field.store
+            and sql.table_exists(cr, self._table)
+            and not sql.column_exists(cr, self._table, field.name)
+        ):
+            sql.create_column(cr, self._table, field.name, field.column_type[1])
+            self.pool.post_init(self._backfill_validation_status)
+        return super()._auto_init()
+
+    @api.model
+    def _backfill_validation_status(self, batch_size=1000):
+        """Compute the stored validation_status of existing documents."""
+        field = self._fields["validation_status"]
+        # Documents without reviews have never been under validation
+        self.env.cr.execute(
+            SQL(
+                """UPDATE %(table)s doc
+                      SET %(column)s = 'no'
+                    WHERE NOT EXISTS (
+                        SELECT 1
+                          FROM tier_review review
+                         WHERE review.model = %(model)s
+                           AND review.res_id = doc.id
+                    )""",
+                table=SQL.identifier(self._table),
+                column=SQL.identifier(field.name),
+                model=self._name,
+            )
+        )
+        self.env.cr.execute(
+            SQL(
+                "SELECT DISTINCT res_id FROM tier_review WHERE model = %s",
+                self._name,
+            )
+        )
+        res_ids = [row[0] for row in self.env.cr.fetchall()]
+        for batch_ids in split_every(batch_size, res_ids):
+            records = self.browse(batch_ids).exists()
+            self.env.add_to_compute(field, records)
+            records.flush_recordset([field.name])
+            self.env.invalidate_all()
 
     def _compute_hide_reviews(self):
         for rec in self:
@@ -245,53 +357,70 @@ class TierValidation(models.AbstractModel):
         return any([s == "rejected" for s in reviews.mapped("status")])
 
     def _compute_need_validation(self):
-        for rec in self:
-            if isinstance(rec.id, models.NewId):
-                rec.need_validation = False
-                continue
-            tiers = (
-                self.env["tier.definition"]
-                .with_context(active_test=True)
-                .search(
-                    [
-                        ("model", "=", self._name),
-                        ("company_id", "in", [False] + rec._get_company().ids),
-                    ]
-                )
-            )
-            valid_tiers = any([rec.evaluate_tier(tier) for tier in tiers])
-            rec.need_validation = (
-                not rec.review_ids and valid_tiers and rec._check_state_from_condition()
+        new_records = self.filtered(lambda r: isinstance(r.id, models.NewId))
+        new_records.need_validation = False
+        records = (self - new_records).filtered(
+            lambda r: not r.review_ids and r._check_state_from_condition()
+        )
+        valid_ids = set()
+        for company, company_records in records._group_by_tier_company().items():
+            tiers = self.env["tier.definition"]._get_tier_definitions(
+                self._name, company
             )
+            for tier in tiers:
+                candidates = company_records.filtered(lambda r: r.id not in valid_ids)
+                if not candidates:
+                    break
+                valid_ids.update(candidates._evaluate_tier_batch(tier).ids)
+        for rec in self - new_records:
+            rec.need_validation = rec.id in valid_ids
+
+    def _group_by_tier_company(self):
+        """Split ``self`` by the company used to select its tier definitions."""
+        company_res_ids = defaultdict(list)
+        for rec in self:
+            company_res_ids[rec._get_company()].append(rec.id)
+        return {
+            company: self.browse(res_ids)
+            for company, res_ids in company_res_ids.items()
+        }
 
     def evaluate_tier(self, tier):
         if tier.definition_domain:
-            domain = literal_eval(tier.definition_domain)
-            return self.filtered_domain(domain)
+            return self.filtered_domain(tier._get_definition_domain())
         else:
             return self
 
+    def _evaluate_tier_batch(self, tier):
+        """Recordset version of ``evaluate_tier``: return the records of
+        ``self`` matching ``tier``, using a single search for saved records."""
+        if not tier.definition_domain:
+            return self
+        domain = tier._get_definition_domain()
+        records = self.filtered(lambda r: isinstance(r.id, int))
+        matching_ids = set(
+            records.sudo()
+            .with_context(active_test=False)
+            .search(expression.AND([[("id", "in", records.ids)], domain]))
+            .ids
+        )
+        new_records = (self - records).filtered_domain(domain)
+        return self.filtered(lambda r: r.id in matching_ids) | new_records
+
     @api.model
     def _get_validation_exceptions(self, extra_domain=None, add_base_exceptions=True):
         """Return Tier Validation Exception field names that matchs custom domain."""
-        exception_fields = (
-            self.env["tier.validation.exception"]
-            .sudo()
-            .search(
-                [
-                    ("model_name", "=", self._name),
-                    ("company_id", "in", [False] + self._get_company().ids),
-                    "|",
-                    ("group_ids", "in", self.env.user.groups_id.ids),
-                    ("group_ids", "=", False),
-                    *(extra_domain or []),
-                ]
-            )
-            .mapped("field_ids.name")
+        exception_fields = self.env[
+            "tier.validation.exception"
+        ]._get_exception_field_names(
+            self._name,
+            self._get_company().id,
+            tuple(sorted(self.env.user.groups_id.ids)),
+            extra_domain or [],
         )
         if add_base_exceptions:
-            exception_fields += BASE_EXCEPTION_FIELDS
-        return list(set(exception_fields))
+            exception_fields |= set(BASE_EXCEPTION_FIELDS)
+        return list(exception_fields)
 
     @api.model
     def _get_all_validation_exceptions(self):
@@ -368,18 +497,61 @@ class TierValidation(models.AbstractModel):
         ) not in (self._state_to + [self._cancel_state])
 
     def write(self, vals):
-        self._tier_validation_check_state_on_write(vals)
-        self._tier_validation_check_write_allowed(vals)
-        self._tier_validation_check_write_remove_reviews(vals)
-        return super().write(vals)
+        records = self._tier_validation_prefetch_current_state()
+        records._tier_validation_check_state_on_write(vals)
+        records._tier_validation_check_write_allowed(vals)
+        records._tier_validation_check_write_remove_reviews(vals)
+        res = super().write(vals)
+        self._tier_validation_recompute_field_reviewers(vals)
+        return res
+
+    def _tier_validation_recompute_field_reviewers(self, vals):
+        """Recompute the reviewers of the open reviews that take them from a
+        field of the record, when that field is written."""
+        field_names = self.env["tier.definition"]._get_reviewer_field_names(
+            self._name
+        )
+        if not field_names.intersection(vals):
+            return
+        reviews = self.review_ids.filtered(
+            lambda r: r.status in ("waiting", "pending")
+            and r.reviewer_field_id.name in vals
+        )
+        if reviews:
+            self.env.add_to_compute(reviews._fields["reviewer_ids"], reviews)
 
     def _write_multi(self, vals_list):
-        for rec, vals in zip(self, vals_list, strict=False):
+        records = self._tier_validation_prefetch_current_state()
+        for rec, vals in zip(records, vals_list, strict=False):
             if rec._tier_validation_state_field_is_computed:
                 rec._tier_validation_check_state_on_write(vals)
                 rec._tier_validation_check_write_remove_reviews(vals)
         return super()._write_multi(vals_list)
 
+    def _tier_validation_prefetch_current_state(self):
+        """Read the raw state of all the records at once.
+
+        Return ``self`` with the values in its context, where
+        ``_tier_validation_get_current_state_value`` looks first, so that the
+        checks done before a write do not query the state record by record.
+        """
+        res_ids = tuple(res_id for res_id in self._ids if isinstance(res_id, int))
+        if not self._tier_validation_state_field_is_computed or not res_ids:
+            return self
+        self.env.cr.execute(
+            SQL(
+                "SELECT id, %(field)s FROM %(table)s WHERE id IN %(res_ids)s",
+                field=SQL.identifier(self._state_field),
+                table=SQL.identifier(self._table),
+                res_ids=res_ids,
+            )
+        )
+        current_states = dict(self.env.context.get("tier_validation_states", {}))
+        model_states = dict(current_states.get(self._name, {}))
+        model_states.update(self.env.cr.fetchall())
+        current_states[self._name] = frozendict(model_states)
+        return self.with_context(tier_validation_states=frozendict(current_states))
+
     def _tier_validation_get_current_state_value(self):
         """Get the current value from the cache or the database.
 
@@ -388,6 +560,9 @@ class TierValidation(models.AbstractModel):
         """
         self.ensure_one()
         if self._tier_validation_state_field_is_computed and isinstance(self.id, int):
+            current_states = self.env.context.get("tier_validation_states", {})
+            if self.id in current_states.get(self._name, {}):
+                return current_states[self._name][self.id]
             self.env.cr.execute(
                 SQL(
                     "select %(field)s from %(table)s where id = %(res_id)s",
@@ -692,16 +867,19 @@ class TierValidation(models.AbstractModel):
         subscribe = "message_subscribe"
         post = "message_post"
         if hasattr(self, post) and hasattr(self, subscribe):
-            for rec in self.sudo():
-                users_to_notify = tier_reviews.filtered(
-                    lambda r, x=rec: r.definition_id.notify_on_create
-                    and r.res_id == x.id
-                ).mapped("reviewer_ids")
-                # Subscribe reviewers and notify
-                if len(users_to_notify) > 0:
-                    getattr(rec, subscribe)(
-                        partner_ids=users_to_notify.mapped("partner_id").ids
-                    )
+            users_to_notify = defaultdict(lambda: self.env["res.users"])
+            for review in tier_reviews.filtered("definition_id.notify_on_create"):
+                users_to_notify[review.res_id] |= review.reviewer_ids
+            # Documents notifying the same reviewers are subscribed at once
+            res_ids_by_partners = defaultdict(list)
+            for rec in self:
+                if users_to_notify.get(rec.id):
+                    partners = users_to_notify[rec.id].partner_id
+                    res_ids_by_partners[tuple(sorted(partners.ids))].append(rec.id)
+            for partner_ids, res_ids in res_ids_by_partners.items():
+                records = self.sudo().browse(res_ids)
+                getattr(records, subscribe)(partner_ids=list(partner_ids))
+                for rec in records:
                     getattr(rec, post)(
                         subtype_xmlid=self._get_requested_notification_subtype(),
                         body=rec._notify_created_review_body(),
@@ -731,18 +909,19 @@ class TierValidation(models.AbstractModel):
         td_obj = self.env["tier.definition"]
         tr_obj = self.env["tier.review"]
         vals_list = []
-        for rec in self:
-            if rec._check_state_from_condition() and rec.need_validation:
-                tier_definitions = td_obj.search(
-                    [
-                        ("model", "=", self._name),
-                        ("company_id", "in", [False] + rec._get_company().ids),
-                    ],
-                    order="sequence desc",
-                )
+        records = self.filtered(
+            lambda r: r._check_state_from_condition() and r.need_validation
+        )
+        for company, company_records in records._group_by_tier_company().items():
+            # Each definition is evaluated once on all the documents
+            tier_definitions = [
+                (td, set(company_records._evaluate_tier_batch(td).ids))
+                for td in td_obj._get_tier_definitions(self._name, company)
+            ]
+            for rec in company_records:
                 sequence = 0
-                for td in tier_definitions:
-                    if rec.evaluate_tier(td):
+                for td, res_ids in tier_definitions:
+                    if rec.id in res_ids:
                         sequence += 1
                         vals_list.append(rec._prepare_tier_review_vals(td, sequence))
         created_trs = tr_obj.create(vals_list)
@@ -796,10 +975,11 @@ class TierValidation(models.AbstractModel):
                 rec._notify_restarted_review()
 
     @api.model
-    def _update_counter(self, review_counter):
+    def _update_counter(self, review_counter=None):
+        """Recompute the reviews of the records. The reviewers whose pending
+        counters changed are notified by tier.review right before the commit,
+        ``review_counter`` is only kept for compatibility."""
         self.review_ids._compute_can_review()
-        channel = "base.tier.validation/updated"
-        self.env.user.partner_id._bus_send(channel, review_counter)
 
     def unlink(self):
         self.mapped("review_ids").unlink()
@@ -830,39 +1010,29 @@ class TierValidation(models.AbstractModel):
         return "bool(review_ids)"
 
     @api.model
-    def get_view(self, view_id=None, view_type="form", **options):
-        res = super().get_view(view_id=view_id, view_type=view_type, **options)
-        View = self.env["ir.ui.view"]
+    def _get_view(self, view_id=None, view_type="form", **options):
+        arch, view = super()._get_view(view_id, view_type, **options)
         if view_type == "form" and not self._tier_validation_manual_config:
-            doc = etree.XML(res["arch"])
+            # Done before the post-processing, so the result ends in the view
+            # cache along with the fields of the added nodes
             params = {}
-            all_models = res["models"].copy()  # {modelname(str) ➔ fields(tuple)}
-            for node in doc.xpath(self._tier_validation_buttons_xpath):
+            for node in arch.xpath(self._tier_validation_buttons_xpath):
                 # By default, after the last button of the header
                 # _add_tier_validation_buttons process
                 new_node = self._add_tier_validation_buttons(node, params)
-                new_arch, new_models = View.postprocess_and_fields(new_node, self._name)
-                new_node = etree.fromstring(new_arch)
                 for new_element in new_node:
                     node.addnext(new_element)
-                _merge_view_fields(all_models, new_models)
-            for node in doc.xpath("/form/sheet"):
+            for node in arch.xpath("/form/sheet"):
                 # _add_tier_validation_label process
                 new_node = self._add_tier_validation_label(node, params)
-                new_arch, new_models = View.postprocess_and_fields(new_node, self._name)
-                new_node = etree.fromstring(new_arch)
                 for new_element in new_node:
                     node.addprevious(new_element)
-                _merge_view_fields(all_models, new_models)
                 # _add_tier_validation_reviews process
                 new_node = self._add_tier_validation_reviews(node, params)
-                new_arch, new_models = View.postprocess_and_fields(new_node, self._name)
-                new_node = etree.fromstring(new_arch)
                 node.append(new_node)
-                _merge_view_fields(all_models, new_models)
             excepted_fields = self._get_all_validation_exceptions()
             all_fields = self.fields_get(attributes=("readonly",))
-            for node in doc.xpath("//field[@name][not(ancestor::field)]"):
+            for node in arch.xpath("//field[@name][not(ancestor::field)]"):
                 field_name = node.attrib.get("name")
                 if field_name in excepted_fields:
                     continue
@@ -876,9 +1046,15 @@ class TierValidation(models.AbstractModel):
                     # if the view doesn't set one
                     continue
                 node.attrib["readonly"] = new_r_modifier
-            res["arch"] = etree.tostring(doc)
-            res["models"] = frozendict(all_models)
-        return res
+        return arch, view
+
+    @api.model
+    def _get_view_cache_key(self, view_id=None, view_type="form", **options):
+        key = super()._get_view_cache_key(view_id, view_type, **options)
+        if view_type == "form" and not self._tier_validation_manual_config:
+            # The readonly attributes depend on the exceptions of the user
+            key += (frozenset(self._get_all_validation_exceptions()),)
+        return key
 
     def _notify_review_available(self, tier_reviews):
         """method to notify when reaching pending"""
@@ -899,11 +1075,3 @@ class TierValidation(models.AbstractModel):
                     body=rec._notify_requested_review_body(),
                 )
 
-
-def _merge_view_fields(all_models: dict, new_models: dict):
-    """Merge new_models into all_models. Both are {modelname(str) ➔ fields(tuple)}."""
-    for model, view_fields in new_models.items():
-        if model in all_models:
-            all_models[model] = tuple(set(all_models[model]) | set(view_fields))
-        else:
-            all_models[model] = tuple(view_fields)
@@ -1,7 +1,7 @@
 # Copyright 2024 Moduon Team (https://www.moduon.team)
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import api, exceptions, fields, models
+from odoo import api, exceptions, fields, models, tools
 
 from .tier_validation import BASE_EXCEPTION_FIELDS
 
@@ -60,6 +60,48 @@ class TierValidationException(models.Model):
         help="Allowed groups to use this Tier Validation Exception",
     )
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return res
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @tools.ormcache("model_name", "company_id", "group_ids", "str(extra_domain)")
+    def _get_exception_field_names(
+        self, model_name, company_id, group_ids, extra_domain
+    ):
+        """Names of the fields exempted for ``model_name`` in ``company_id``
+        for users belonging to ``group_ids``.
+
+        The group ids are part of the key, so a change of the user groups
+        does not need any invalidation.
+        """
+        return frozenset(
+            self.sudo()
+            .search(
+                [
+                    ("model_name", "=", model_name),
+                    ("company_id", "in", [False, company_id]),
+                    "|",
+                    ("group_ids", "in", list(group_ids)),
+                    ("group_ids", "=", False),
+                    *extra_domain,
+                ]
+            )
+            .mapped("field_ids.name")
+        )
+
     @api.depends("model_id")
     def _compute_valid_model_field_ids(self):
         model_names = self.mapped("model_name")
@@ -39,6 +39,13 @@ export class TierReviewMenu extends Component {
         ];
     }
 
+    openInbox() {
+        this.dropdown.close();
+        this.action.doAction("base_tier_validation.tier_review_inbox_action", {
+            clearBreadcrumbs: true,
+        });
+    }
+
     openReviewGroup(group) {
         this.dropdown.close();
         const context = {};
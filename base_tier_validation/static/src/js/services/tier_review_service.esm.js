@@ -8,16 +8,25 @@ export class TierReviewService {
         this.busService = services.bus_service;
     }
     setup() {
-        this.busService.subscribe("base.tier.validation/updated", (payload) => {
-            if (payload.review_created) {
-                this.store.tierReviewCounter++;
-            }
-            if (payload.review_deleted) {
-                this.store.tierReviewCounter--;
-            }
-        });
+        this.busService.subscribe("base.tier.validation/updated", (payload) =>
+            this.applyCounters(payload)
+        );
         this.busService.start();
     }
+    /**
+     * Replace the systray groups by the review counters sent by the server,
+     * without fetching them again.
+     *
+     * @param {Object} payload
+     * @param {Array} payload.groups review counters, as review_user_count
+     */
+    applyCounters({groups = []}) {
+        this.store.tierReviewGroups = groups;
+        this.store.tierReviewCounter = groups.reduce(
+            (total, group) => total + (group.pending_count || 0),
+            0
+        );
+    }
 }
 
 export const tierReviewService = {
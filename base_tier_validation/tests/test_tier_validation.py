@@ -1081,6 +1081,529 @@ class TierTierValidation(CommonTierValidation):
 
         self.assertEqual(len(reviews), 2)
 
+    def test_32_search_can_review(self):
+        """The SQL search of can_review follows the approve sequence."""
+        test_record = self.test_model.create({"test_field": 3.5})
+        test_record.with_user(self.test_user_2.id).request_validation()
+        self.test_record.with_user(self.test_user_2.id).request_validation()
+        records = self.test_record + test_record
+        for user in (self.test_user_1, self.test_user_2):
+            model = self.test_model.with_user(user)
+            model.invalidate_model()
+            found = model.search(
+                [("id", "in", records.ids), ("can_review", "=", True)]
+            )
+            expected = records.with_user(user).filtered("can_review")
+            self.assertEqual(found.ids, expected.ids)
+        # User 1 is first in the sequence of test_record, user 2 is not
+        self.assertIn(
+            test_record,
+            self.test_model.with_user(self.test_user_1).search(
+                [("can_review", "=", True)]
+            ),
+        )
+        self.assertNotIn(
+            test_record,
+            self.test_model.with_user(self.test_user_2).search(
+                [("can_review", "=", True)]
+            ),
+        )
+
+    def test_33_tier_definition_cache(self):
+        """The cached definitions follow creations and archivings."""
+        model_name = self.test_model._name
+        definitions = self.tier_def_obj._get_tier_definitions(
+            model_name, self.main_company
+        )
+        self.assertIn(self.tier_definition, definitions)
+        self.assertFalse(definitions.filtered(lambda d: d.model != model_name))
+        self.tier_definition.active = False
+        definitions = self.tier_def_obj._get_tier_definitions(
+            model_name, self.main_company
+        )
+        self.assertNotIn(self.tier_definition, definitions)
+        other_definition = self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "individual",
+                "reviewer_id": self.test_user_2.id,
+                "company_id": self.other_company.id,
+            }
+        )
+        self.assertNotIn(
+            other_definition,
+            self.tier_def_obj._get_tier_definitions(model_name, self.main_company),
+        )
+        self.assertIn(
+            other_definition,
+            self.tier_def_obj._get_tier_definitions(model_name, self.other_company),
+        )
+
+    def test_34_evaluate_tier_batch(self):
+        """Batch evaluation returns the same records as evaluate_tier."""
+        test_record = self.test_model.create({"test_field": 3.5})
+        records = self.test_record + test_record
+        self.assertEqual(
+            self.tier_definition._get_definition_domain(),
+            [("test_field", "=", 1.0)],
+        )
+        definitions = self.tier_def_obj._get_tier_definitions(
+            self.test_model._name, self.main_company
+        )
+        for definition in definitions:
+            expected = records.filtered(lambda r, d=definition: r.evaluate_tier(d))
+            self.assertEqual(records._evaluate_tier_batch(definition), expected)
+        self.assertEqual(
+            records._evaluate_tier_batch(self.tier_definition), self.test_record
+        )
+        self.assertEqual(records.mapped("need_validation"), [True, True])
+
+    def test_35_request_validation_batch(self):
+        """Requesting the validation of several documents at once."""
+        self.tier_definition.notify_on_create = True
+        test_records = self.test_model.create(
+            [{"test_field": 1.0}, {"test_field": 3.5}, {"test_field": 2.0}]
+        )
+        reviews = test_records.with_user(self.test_user_2.id).request_validation()
+        self.assertEqual(len(reviews), 3)
+        self.assertEqual(
+            test_records[0].review_ids.definition_id, self.tier_definition
+        )
+        self.assertEqual(
+            sorted(test_records[1].review_ids.mapped("sequence")), [1, 2]
+        )
+        self.assertFalse(test_records[2].review_ids)
+        self.assertIn(
+            self.test_user_1.partner_id,
+            test_records[0].message_partner_ids,
+        )
+        self.assertNotIn(
+            self.test_user_1.partner_id,
+            test_records[1].message_partner_ids,
+        )
+
+    def test_36_validation_exception_cache(self):
+        """Cached exception fields follow the tier.validation.exception."""
+        exception_obj = self.env["tier.validation.exception"]
+        group_ids = tuple(sorted(self.env.user.groups_id.ids))
+
+        def exception_field_names():
+            return exception_obj._get_exception_field_names(
+                "res.partner", self.main_company.id, group_ids, []
+            )
+
+        self.assertFalse(exception_field_names())
+        exception = exception_obj.create(
+            {
+                "model_id": self.env["ir.model"]._get("res.partner").id,
+                "field_ids": [
+                    (6, 0, self.env["ir.model.fields"]._get("res.partner", "name").ids)
+                ],
+            }
+        )
+        self.assertEqual(exception_field_names(), {"name"})
+        exception.group_ids = self.env.ref("base.group_portal")
+        self.assertFalse(exception_field_names())
+
+    def test_37_prefetch_current_state(self):
+        """The raw state of computed state records is read for all at once."""
+        records = self.test_model_computed.create(
+            [{"test_field": 0.5}, {"test_field": 0.5}]
+        )
+        records.flush_recordset()
+        # The new state is computed in cache but not yet written
+        records.write({"cancelled": True})
+        self.assertEqual(records.mapped("state"), ["cancel", "cancel"])
+        prefetched = records._tier_validation_prefetch_current_state()
+        self.assertEqual(
+            [rec._tier_validation_get_current_state_value() for rec in prefetched],
+            ["draft", "draft"],
+        )
+        self.assertEqual(prefetched, records)
+
+    def test_38_review_index(self):
+        """All review computes are derived from the same per record index."""
+        test_record = self.test_model.create({"test_field": 3.5})
+        test_record.with_user(self.test_user_2.id).request_validation()
+        self.test_record.with_user(self.test_user_2.id).request_validation()
+        records = self.test_record + test_record
+        index = records._get_review_index()
+        self.assertEqual(set(index), set(records.ids))
+        entry = index[test_record.id]
+        self.assertEqual(len(entry["open_reviews"]), 2)
+        self.assertEqual(entry["min_sequence"], 1)
+        self.assertEqual(entry["statuses"], {"waiting", "pending"})
+        self.assertEqual(
+            entry["next_review"],
+            test_record.review_ids.filtered(lambda r: r.sequence == 1),
+        )
+        self.assertEqual(
+            entry["reviewer_ids"], {self.test_user_1.id, self.test_user_2.id}
+        )
+        self.assertEqual(test_record.reviewer_ids, self.test_user_1 + self.test_user_2)
+        self.assertEqual(test_record.validation_status, "pending")
+        # Only the first reviewer of the sequence can review
+        self.assertEqual(
+            test_record.with_user(self.test_user_1)._get_sequences_to_approve(
+                self.test_user_1
+            ),
+            [1],
+        )
+        self.assertFalse(
+            test_record.with_user(self.test_user_2)._get_sequences_to_approve(
+                self.test_user_2
+            )
+        )
+        self.assertTrue(test_record.with_user(self.test_user_1).can_review)
+        self.assertFalse(test_record.with_user(self.test_user_2).can_review)
+
+    def test_39_pending_count_deltas(self):
+        """Each reviewer whose pending counter changed gets its own delta."""
+        Review = self.env["tier.review"]
+        Pending = self.env["tier.review.pending"]
+        self.env.cr.precommit.data.pop("tier.review.pending_reviewers", None)
+        test_record = self.test_model.create({"test_field": 3.5})
+        test_record.with_user(self.test_user_2.id).request_validation()
+        Pending._refresh_dirty()
+        snapshot = self.env.cr.precommit.data["tier.review.pending_reviewers"]
+        document = (test_record._name, test_record.id)
+        self.assertEqual(snapshot[document], set())
+        self.assertEqual(
+            Review._get_pending_count_deltas(snapshot),
+            {self.test_user_1.id: {test_record._name: 1}},
+        )
+        self.env.cr.precommit.data.pop("tier.review.pending_reviewers")
+        # Approving the first tier moves the counter to the next reviewer
+        test_record.with_user(self.test_user_1.id).validate_tier()
+        snapshot = self.env.cr.precommit.data["tier.review.pending_reviewers"]
+        self.assertEqual(snapshot[document], {self.test_user_1.id})
+        Pending._refresh_dirty()
+        self.assertEqual(
+            Review._get_pending_count_deltas(snapshot),
+            {
+                self.test_user_1.id: {test_record._name: -1},
+                self.test_user_2.id: {test_record._name: 1},
+            },
+        )
+        with mock.patch.object(
+            type(self.env["res.partner"]), "_bus_send", autospec=True
+        ) as bus_send:
+            self.env.cr.precommit.run()
+        payloads = {
+            partner.id: payload for partner, __, payload in bus_send.call_args_list
+        }
+        # The counters are the ones the systray would fetch
+        self.assertEqual(
+            set(payloads), set((self.test_user_1 + self.test_user_2).partner_id.ids)
+        )
+        self.assertEqual(
+            payloads[self.test_user_2.partner_id.id]["groups"],
+            self.env["res.users"].with_user(self.test_user_2).review_user_count(),
+        )
+
+    def test_40_review_user_count(self):
+        """The systray counters always reflect the current reviews."""
+        Users = self.env["res.users"].with_user(self.test_user_1)
+        self.test_record.with_user(self.test_user_2.id).request_validation()
+        counters = Users.review_user_count()
+        self.assertEqual(
+            [(c["model"], c["pending_count"]) for c in counters],
+            [(self.test_record._name, 1)],
+        )
+        self.assertEqual(counters[0]["id"], self.test_record.id)
+        self.test_record.with_user(self.test_user_1).validate_tier()
+        self.assertFalse(Users.review_user_count())
+
+    def test_41_pending_reviewers_table(self):
+        """Only the reviewers who can act now are in the pending table."""
+        Pending = self.env["tier.review.pending"]
+        test_record = self.test_model.create({"test_field": 3.5})
+        test_record.with_user(self.test_user_2.id).request_validation()
+
+        def pending_users():
+            Pending._refresh_dirty()
+            return Pending.search(
+                [("model", "=", test_record._name), ("res_id", "=", test_record.id)]
+            ).user_id
+
+        self.assertEqual(pending_users(), self.test_user_1)
+        self.assertEqual(
+            self.test_model.search([("reviewer_ids", "in", self.test_user_1.id)]),
+            test_record,
+        )
+        self.assertFalse(
+            self.test_model.search([("reviewer_ids", "=", self.test_user_2.id)])
+        )
+        self.assertNotIn(
+            test_record, self.test_model.search([("reviewer_ids", "=", False)])
+        )
+        test_record.with_user(self.test_user_1.id).validate_tier()
+        self.assertEqual(pending_users(), self.test_user_2)
+        test_record.with_user(self.test_user_2.id).validate_tier()
+        self.assertFalse(pending_users())
+        # A full rebuild gives the same rows
+        Pending._rebuild()
+        self.assertFalse(pending_users())
+
+    def test_42_review_inbox(self):
+        """The inbox lists the reviews of the user and reviews them."""
+        test_record = self.test_model.create({"test_field": 3.5})
+        test_record.with_user(self.test_user_2.id).request_validation()
+        self.test_record.with_user(self.test_user_2.id).request_validation()
+        Inbox = self.env["tier.review.inbox"].with_user(self.test_user_1)
+        self.assertEqual(
+            {(inbox.model, inbox.res_id) for inbox in Inbox.search([])},
+            {
+                (test_record._name, test_record.id),
+                (self.test_record._name, self.test_record.id),
+            },
+        )
+        # User 2 only has to review once user 1 approved the first tier
+        self.assertFalse(
+            self.env["tier.review.inbox"].with_user(self.test_user_2).search([])
+        )
+        inbox = Inbox.search([("res_id", "=", test_record.id)])
+        self.assertEqual(inbox.document_name, test_record.display_name)
+        self.assertEqual(inbox.age, 0)
+        inbox.action_validate_tier()
+        self.assertEqual(
+            self.env["tier.review.inbox"]
+            .with_user(self.test_user_2)
+            .search([])
+            .mapped("res_id"),
+            [test_record.id],
+        )
+
+    def test_43_search_reviewer_ids_subquery(self):
+        """Reviewer searches are done with subqueries, not lists of ids."""
+        self.test_record.with_user(self.test_user_2.id).request_validation()
+        for operator, value in (
+            ("ilike", self.test_user_1.name),
+            ("in", [self.test_user_1.id]),
+            ("=", False),
+        ):
+            domain = self.test_model._search_reviewer_ids(operator, value)
+            self.assertNotIsInstance(domain[0][2], list)
+        self.assertEqual(
+            self.test_model.search([("reviewer_ids", "ilike", self.test_user_1.name)]),
+            self.test_record,
+        )
+        self.assertFalse(
+            self.test_model.search([("reviewer_ids", "ilike", self.test_user_2.name)])
+        )
+        new_record = self.test_model.create({"test_field": 0.5})
+        no_validation = self.test_model.search([("reviewer_ids", "=", False)])
+        self.assertNotIn(self.test_record, no_validation)
+        self.assertIn(new_record, no_validation)
+
+    def test_44_compute_can_review_by_document(self):
+        """The approval sequence is followed per document in a batch."""
+        records = self.test_model.create([{"test_field": 3.5}, {"test_field": 3.5}])
+        records.with_user(self.test_user_2.id).request_validation()
+        record_a, record_b = records
+        record_a.with_user(self.test_user_1.id).validate_tier()
+        review_a2 = record_a.review_ids.filtered(lambda r: r.sequence == 2)
+        review_a2.status = "waiting"
+        records.review_ids._compute_can_review()
+        self.assertEqual(review_a2.status, "pending")
+        self.assertTrue(review_a2.can_review)
+        review_b1, review_b2 = record_b.review_ids.sorted("sequence")
+        self.assertEqual((review_b1.status, review_b2.status), ("pending", "waiting"))
+        self.assertTrue(review_b1.can_review)
+        self.assertFalse(review_b2.can_review)
+
+    def test_45_group_reviewers_recompute(self):
+        """Only open reviews follow the members of their reviewer group."""
+        group = self.env["res.groups"].create(
+            {"name": "Tier reviewers", "users": [(4, self.test_user_1.id)]}
+        )
+        self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "group",
+                "reviewer_group_id": group.id,
+                "definition_domain": "[('test_field', '=', 0.5)]",
+            }
+        )
+        closed_record, open_record = self.test_model.create(
+            [{"test_field": 0.5}, {"test_field": 0.5}]
+        )
+        (closed_record + open_record).with_user(
+            self.test_user_2.id
+        ).request_validation()
+        closed_record.with_user(self.test_user_1.id).validate_tier()
+        closed_review = closed_record.review_ids
+        open_review = open_record.review_ids
+        self.assertEqual(closed_review.status, "approved")
+        group.write({"users": [(4, self.test_user_2.id)]})
+        self.assertEqual(open_review.reviewer_ids, self.test_user_1 + self.test_user_2)
+        self.assertEqual(closed_review.reviewer_ids, self.test_user_1)
+        self.test_user_3_multi_company.write({"groups_id": [(4, group.id)]})
+        self.assertIn(self.test_user_3_multi_company, open_review.reviewer_ids)
+        self.assertNotIn(self.test_user_3_multi_company, closed_review.reviewer_ids)
+        # The fan-out of the group is reported, the closed reviewers are kept
+        fan_out = {
+            row["group_id"]: row
+            for row in self.env["tier.review"]._report_reviewer_fan_out()
+        }
+        self.assertEqual(fan_out[group.id]["open_reviews"], 1)
+        self.assertEqual(fan_out[group.id]["closed_reviews"], 1)
+        self.assertEqual(fan_out[group.id]["closed_reviewer_rows"], 1)
+        self.assertEqual(closed_review.reviewer_ids, self.test_user_1)
+
+    def test_46_review_values_indexed_once(self):
+        records = self.test_model.create([{"test_field": 1.0}, {"test_field": 1.0}])
+        records.with_user(self.test_user_2).request_validation()
+        records = records.with_user(self.test_user_1)
+        records.invalidate_recordset()
+        with mock.patch.object(
+            TV,
+            "_get_review_index",
+            autospec=True,
+            side_effect=TV._get_review_index,
+        ) as get_review_index:
+            values = records.read(
+                ["can_review", "reviewer_ids", "next_review", "has_comment"]
+            )
+        get_review_index.assert_called_once()
+        self.assertTrue(all(value["can_review"] for value in values))
+        self.assertEqual(
+            [value["reviewer_ids"] for value in values],
+            [self.test_user_1.ids] * 2,
+        )
+
+    def test_47_pending_reviewers_refresh_after_recompute(self):
+        """Reviewers recomputed while the pending table is refreshed are
+        rebuilt by the same refresh."""
+        group = self.env["res.groups"].create(
+            {"name": "Tier reviewers", "users": [(4, self.test_user_1.id)]}
+        )
+        self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "group",
+                "reviewer_group_id": group.id,
+                "definition_domain": "[('test_field', '=', 0.5)]",
+            }
+        )
+        record = self.test_model.create({"test_field": 0.5})
+        record.with_user(self.test_user_2.id).request_validation()
+        self.env["tier.review.pending"]._refresh_dirty()
+        # The reviewers of the review are only scheduled for recompute
+        group.write({"users": [(4, self.test_user_2.id)]})
+        self.assertIn(
+            record,
+            self.test_model.search([("reviewer_ids", "in", self.test_user_2.ids)]),
+        )
+        self.assertIn(
+            record,
+            self.test_model.with_user(self.test_user_2).search(
+                [("can_review", "=", True)]
+            ),
+        )
+
+    def test_48_pending_count_deltas_on_reviewer_change(self):
+        """A change of the reviewers of an open review moves the counters."""
+        Pending = self.env["tier.review.pending"]
+        group = self.env["res.groups"].create(
+            {"name": "Tier reviewers", "users": [(4, self.test_user_1.id)]}
+        )
+        self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "group",
+                "reviewer_group_id": group.id,
+                "definition_domain": "[('test_field', '=', 0.5)]",
+            }
+        )
+        record = self.test_model.create({"test_field": 0.5})
+        record.with_user(self.test_user_2.id).request_validation()
+        Pending._refresh_dirty()
+        self.env.cr.precommit.data.pop("tier.review.pending_reviewers", None)
+        group.write({"users": [(4, self.test_user_2.id)]})
+        Pending._refresh_dirty()
+        snapshot = self.env.cr.precommit.data["tier.review.pending_reviewers"]
+        self.assertEqual(
+            self.env["tier.review"]._get_pending_count_deltas(snapshot),
+            {self.test_user_2.id: {record._name: 1}},
+        )
+
+    def test_49_inbox_row_stable(self):
+        """Inbox rows keep their id while their review stays pending."""
+        test_record = self.test_model.create({"test_field": 3.5})
+        test_record.with_user(self.test_user_2.id).request_validation()
+        Inbox = self.env["tier.review.inbox"].with_user(self.test_user_1)
+        inbox = Inbox.search([("res_id", "=", test_record.id)])
+        self.assertEqual(len(inbox), 1)
+        # Any change of the reviews of the document syncs its rows again
+        second_review = test_record.review_ids.filtered(lambda r: r.sequence == 2)
+        second_review.write({"status": second_review.status})
+        self.assertEqual(Inbox.search([("res_id", "=", test_record.id)]), inbox)
+        self.assertEqual(inbox.review_id.sequence, 1)
+
+    def test_50_pending_status_partial_recompute(self):
+        """A later tier does not become pending while an earlier open review
+        of the document is outside of the recomputed reviews."""
+        test_record = self.test_model.create({"test_field": 3.5})
+        test_record.with_user(self.test_user_2.id).request_validation()
+        first_review, second_review = test_record.review_ids.sorted("sequence")
+        first_review.status = "waiting"
+        second_review._compute_can_review()
+        self.assertEqual(second_review.status, "waiting")
+        first_review._compute_can_review()
+        self.assertEqual(first_review.status, "pending")
+
+    def test_51_group_reviewers_from_user_form(self):
+        """Adding a user to a reviewer group from the user form makes them a
+        reviewer of the open reviews of the group."""
+        group = self.env["res.groups"].create(
+            {"name": "Tier reviewers", "users": [(4, self.test_user_1.id)]}
+        )
+        self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "group",
+                "reviewer_group_id": group.id,
+                "definition_domain": "[('test_field', '=', 0.5)]",
+            }
+        )
+        record = self.test_model.create({"test_field": 0.5})
+        record.with_user(self.test_user_2.id).request_validation()
+        review = record.review_ids
+        self.test_user_2.write({f"in_group_{group.id}": True})
+        self.assertIn(self.test_user_2, review.reviewer_ids)
+        self.test_user_2.write({f"in_group_{group.id}": False})
+        self.assertNotIn(self.test_user_2, review.reviewer_ids)
+
+    def test_52_search_reviewer_ids_can_review(self):
+        """Reviewer searches follow the can_review of the reviews, sequenced
+        or not."""
+        self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "individual",
+                "reviewer_id": self.test_user_3_multi_company.id,
+                "definition_domain": "[('test_field', '>', 3.0)]",
+                "sequence": 3,
+            }
+        )
+        record = self.test_model.create({"test_field": 3.5})
+        record.with_user(self.test_user_2.id).request_validation()
+        for user in (
+            self.test_user_1,
+            self.test_user_2,
+            self.test_user_3_multi_company,
+        ):
+            reviewable = record.review_ids.filtered(
+                lambda r, user=user: user in r.reviewer_ids and r.can_review
+            )
+            self.assertEqual(
+                self.test_model.search(
+                    [("reviewer_ids", "=", user.id), ("id", "=", record.id)]
+                ),
+                record if reviewable else self.test_model,
+            )
+
 
 @tagged("at_install")
 class TierTierValidationView(CommonTierValidation):
@@ -1111,3 +1634,12 @@ class TierTierValidationView(CommonTierValidation):
         self.assertIn("need_validation", view["models"][model])
         self.assertIn("next_review", view["models"][model])
         self.assertIn("review_ids", view["models"][model])
+
+    def test_get_view_cached(self):
+        """The tier validation nodes are added once, then served from cache."""
+        self.test_model_2.get_view()
+        with mock.patch.object(TV, "_add_tier_validation_buttons") as add_buttons:
+            view = self.test_model_2.get_view()
+        add_buttons.assert_not_called()
+        form = etree.fromstring(view["arch"])
+        self.assertTrue(form.xpath("//button[@name='request_validation']"))
@@ -44,3 +44,82 @@ class TierTierValidation(CommonTierValidation):
         with freeze_time(in_9_days):
             self.tier_definition._cron_send_review_reminder()
         self.assertEqual(review.last_reminder_date, in_9_days)
+
+    def test_validation_reminder_all_due(self):
+        """All the due reviews are reminded in a single run."""
+        tier_definition = self.tier_definition
+        tier_definition.notify_reminder_delay = 3
+        records = self.test_record + self.test_model.create({"test_field": 1.0})
+        records.with_user(self.test_user_2.id).request_validation()
+        reviews = records.review_ids
+        self.assertEqual(len(reviews), 2)
+        in_4_days = fields.Datetime.add(fields.Datetime.now(), days=4)
+        with freeze_time(in_4_days):
+            self.assertEqual(
+                self.env["tier.definition"]._get_review_ids_needing_reminder(),
+                reviews.sorted("id").ids,
+            )
+            tier_definition._cron_send_review_reminder(batch_size=1)
+            self.assertFalse(
+                self.env["tier.definition"]._get_review_ids_needing_reminder()
+            )
+        self.assertEqual(reviews.mapped("last_reminder_date"), [in_4_days] * 2)
+
+    def test_validation_reminder_digest(self):
+        """In digest mode each reviewer gets one message for all its reviews."""
+        self.env["ir.config_parameter"].sudo().set_param(
+            "base_tier_validation.reminder_digest", True
+        )
+        tier_definition = self.tier_definition
+        tier_definition.notify_reminder_delay = 3
+        records = self.test_record + self.test_model.create({"test_field": 1.0})
+        records.with_user(self.test_user_2.id).request_validation()
+        reviews = records.review_ids
+        partner = self.test_user_1.partner_id
+        messages_before = self.env["mail.message"].search(
+            [("partner_ids", "in", partner.ids)]
+        )
+        in_4_days = fields.Datetime.add(fields.Datetime.now(), days=4)
+        with freeze_time(in_4_days):
+            tier_definition._cron_send_review_reminder(batch_size=1)
+        messages = (
+            self.env["mail.message"].search([("partner_ids", "in", partner.ids)])
+            - messages_before
+        )
+        self.assertEqual(len(messages), 1)
+        for record in records:
+            self.assertIn(record.display_name, messages.body)
+        self.assertEqual(reviews.mapped("last_reminder_date"), [in_4_days] * 2)
+
+    def test_validation_reminder_digest_batches(self):
+        """Digests are sent by batches of reviewers, one message each."""
+        self.env["ir.config_parameter"].sudo().set_param(
+            "base_tier_validation.reminder_digest", True
+        )
+        self.tier_definition.notify_reminder_delay = 3
+        self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "individual",
+                "reviewer_id": self.test_user_2.id,
+                "definition_domain": "[('test_field', '=', 1.0)]",
+                "notify_reminder_delay": 3,
+            }
+        )
+        records = self.test_record + self.test_model.create({"test_field": 1.0})
+        records.with_user(self.test_user_2.id).request_validation()
+        reviews = records.review_ids
+        partners = (self.test_user_1 + self.test_user_2).partner_id
+        messages_before = self.env["mail.message"].search(
+            [("partner_ids", "in", partners.ids)]
+        )
+        in_4_days = fields.Datetime.add(fields.Datetime.now(), days=4)
+        with freeze_time(in_4_days):
+            self.tier_definition._cron_send_review_reminder(batch_size=1)
+        messages = (
+            self.env["mail.message"].search([("partner_ids", "in", partners.ids)])
+            - messages_before
+        )
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages.partner_ids, partners)
+        self.assertEqual(reviews.mapped("last_reminder_date"), [in_4_days] * 4)
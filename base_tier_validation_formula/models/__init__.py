@@ -1,3 +1,5 @@
 from . import tier_definition
 from . import tier_validation
 from . import tier_review
+from . import tier_definition_profile
+from . import res_config_settings
@@ -0,0 +1,11 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import fields, models
+
+
+class ResConfigSettings(models.TransientModel):
+    _inherit = "res.config.settings"
+
+    tier_profile_expressions = fields.Boolean(
+        string="Profile Tier Formulas",
+        config_parameter="base_tier_validation_formula.profile_expressions",
+    )
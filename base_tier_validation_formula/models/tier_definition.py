@@ -1,7 +1,8 @@
 # Copyright 2019 Creu Blanca
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
+from odoo.tools.safe_eval import safe_eval
 
 
 class TierDefinition(models.Model):
@@ -11,11 +12,17 @@ class TierDefinition(models.Model):
         string="Tier Definition Expression",
         help="Write Python code that defines when this tier confirmation "
         "will be needed. The result of executing the expresion must be "
-        "a boolean.",
+        "a boolean. With a batch formula, the expression receives all the "
+        "records to evaluate as recs and must return the matching records "
+        "or their ids.",
         default="""# Available locals:\n#  - rec: current record\nTrue""",
     )
     definition_type = fields.Selection(
-        selection_add=[("formula", "Formula"), ("domain_formula", "Domain & Formula")]
+        selection_add=[
+            ("formula", "Formula"),
+            ("domain_formula", "Domain & Formula"),
+            ("batch_formula", "Batch Formula"),
+        ]
     )
     reviewer_expression = fields.Text(
         string="Review Expression",
@@ -26,6 +33,22 @@ class TierDefinition(models.Model):
         "#  - Expects a recordset of res.users\nrec.env.user",
     )
     review_type = fields.Selection(selection_add=[("expression", "Python Expression")])
+    profile_ids = fields.One2many(
+        comodel_name="tier.definition.profile",
+        inverse_name="definition_id",
+        string="Expression Profiles",
+        readonly=True,
+    )
+
+    @api.onchange("definition_type")
+    def onchange_definition_type(self):
+        if self.definition_type == "batch_formula":
+            self.python_code = (
+                "# Available locals:\n"
+                "#  - recs: records to evaluate\n"
+                "#  - Expects the matching records or their ids\n"
+                "recs"
+            )
 
     @api.onchange("review_type")
     def onchange_review_type(self):
@@ -37,3 +60,34 @@ class TierDefinition(models.Model):
             "rec.env.user"
         )
         return res
+
+    @api.model
+    @tools.ormcache("definition_id", "field_name", "write_date", "code", "names")
+    def _get_expression_function(
+        self, definition_id, field_name, write_date, code, names
+    ):
+        """Function of ``names`` evaluating the ``field_name`` expression of a
+        definition. It is built by ``safe_eval``, which checks the expression
+        and sandboxes the function, once per version of the definition."""
+        return safe_eval(
+            "lambda {}: (\n{}\n)".format(", ".join(names), code),
+            filename=f"tier.definition({definition_id}).{field_name}",
+        )
+
+    def _eval_expression(self, field_name, values):
+        """Evaluate the ``field_name`` expression with ``values`` as locals,
+        reusing the function of the current version of the expression."""
+        self.ensure_one()
+        with self.env["tier.definition.profile"]._profile(self, field_name):
+            function = self._get_expression_function(
+                self.id,
+                field_name,
+                self.write_date,
+                self[field_name],
+                tuple(sorted(values)),
+            )
+            return function(**values)
+
+    def action_reset_profile(self):
+        self.sudo().profile_ids.unlink()
+        return True
@@ -0,0 +1,213 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+SAMPLES_KEY = "tier.definition.profile.samples"
+# Number of the most recent durations kept to compute the 95th percentile
+MAX_SAMPLES = 1000
+
+
+class TierDefinitionProfile(models.Model):
+    """Execution statistics of the python expressions of a tier definition,
+    recorded when the profiling of the expressions is enabled."""
+
+    _name = "tier.definition.profile"
+    _description = "Tier Definition Expression Profile"
+    _order = "p95_time desc, id"
+    _rec_name = "definition_id"
+
+    definition_id = fields.Many2one(
+        comodel_name="tier.definition",
+        required=True,
+        readonly=True,
+        ondelete="cascade",
+        index=True,
+    )
+    model_id = fields.Many2one(related="definition_id.model_id")
+    expression = fields.Selection(
+        selection=[
+            ("python_code", "Tier Definition Expression"),
+            ("reviewer_expression", "Review Expression"),
+        ],
+        required=True,
+        readonly=True,
+    )
+    call_count = fields.Integer(string="Calls", readonly=True)
+    total_time = fields.Float(string="Total Time (ms)", readonly=True)
+    average_time = fields.Float(
+        string="Average Time (ms)", compute="_compute_average_time"
+    )
+    p95_time = fields.Float(
+        string="95th Percentile (ms)",
+        readonly=True,
+        help="95th percentile of the duration of the most recent calls.",
+    )
+    query_count = fields.Integer(string="SQL Queries", readonly=True)
+    samples = fields.Json(readonly=True)
+
+    _sql_constraints = [
+        (
+            "definition_expression_uniq",
+            "unique(definition_id, expression)",
+            "There is a single profile per expression of a definition.",
+        )
+    ]
+
+    @api.depends("call_count", "total_time")
+    def _compute_average_time(self):
+        for profile in self:
+            profile.average_time = (
+                profile.total_time / profile.call_count if profile.call_count else 0.0
+            )
+
+    @api.model
+    def _is_enabled(self):
+        return bool(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param("base_tier_validation_formula.profile_expressions")
+        )
+
+    @api.model
+    @contextmanager
+    def _profile(self, definition, field_name):
+        """Time the evaluation of the ``field_name`` expression of
+        ``definition`` and count the queries it runs, when enabled."""
+        if not self._is_enabled():
+            yield
+            return
+        cr = self.env.cr
+        start = time.perf_counter()
+        query_count = cr.sql_log_count
+        try:
+            yield
+        finally:
+            self._add_sample(
+                definition.id,
+                field_name,
+                (time.perf_counter() - start) * 1000,
+                cr.sql_log_count - query_count,
+            )
+
+    @api.model
+    def _add_sample(self, definition_id, field_name, duration, query_count):
+        """Keep the sample in the transaction, all the samples are saved at
+        once after the commit."""
+        data = self.env.cr.postcommit.data
+        samples = data.get(SAMPLES_KEY)
+        if samples is None:
+            samples = data[SAMPLES_KEY] = defaultdict(lambda: ([], [0]))
+            self.env.cr.postcommit.add(self.browse()._save_samples_postcommit)
+        durations, queries = samples[definition_id, field_name]
+        durations.append(duration)
+        queries[0] += query_count
+
+    @api.model
+    def _pop_samples(self):
+        return self.env.cr.postcommit.data.pop(SAMPLES_KEY, None)
+
+    @api.model
+    def _save_samples_postcommit(self):
+        """Save the samples of the committed transaction in a transaction of
+        their own, so that the concurrent updates of the profiles neither
+        wait on nor make the business transactions fail."""
+        samples = self._pop_samples()
+        if not samples:
+            return
+        try:
+            with self.env.registry.cursor() as cr:
+                self.with_env(self.env(cr=cr))._save_samples(samples)
+        except Exception:
+            _logger.warning(
+                "Could not save the profiling of the tier definitions",
+                exc_info=True,
+            )
+
+    @api.model
+    def _save_samples(self, samples):
+        """Add ``samples``, the durations and query counts by definition and
+        expression, to the profiles."""
+        if not samples:
+            return
+        now = fields.Datetime.now()
+        uid = self.env.uid
+        rows = self.env.execute_query(
+            SQL(
+                """
+                INSERT INTO %(table)s AS profile (
+                    definition_id, expression, call_count, total_time,
+                    query_count, samples, create_uid, create_date, write_uid,
+                    write_date
+                )
+                VALUES %(values)s
+                ON CONFLICT (definition_id, expression) DO UPDATE SET
+                    call_count = profile.call_count + EXCLUDED.call_count,
+                    total_time = profile.total_time + EXCLUDED.total_time,
+                    query_count = profile.query_count + EXCLUDED.query_count,
+                    samples = (
+                        SELECT jsonb_agg(recent.value ORDER BY recent.position)
+                          FROM (
+                            SELECT sample.value, sample.position
+                              FROM jsonb_array_elements(
+                                    COALESCE(profile.samples, '[]'::jsonb)
+                                    || EXCLUDED.samples
+                                   ) WITH ORDINALITY AS sample(value, position)
+                          ORDER BY sample.position DESC
+                             LIMIT %(max_samples)s
+                          ) AS recent
+                    ),
+                    write_uid = EXCLUDED.write_uid,
+                    write_date = EXCLUDED.write_date
+                RETURNING id
+                """,
+                table=SQL.identifier(self._table),
+                values=SQL(", ").join(
+                    SQL(
+                        "(%s, %s, %s, %s, %s, %s::jsonb, %s, %s, %s, %s)",
+                        definition_id,
+                        field_name,
+                        len(durations),
+                        sum(durations),
+                        queries[0],
+                        json.dumps(durations[-MAX_SAMPLES:]),
+                        uid,
+                        now,
+                        uid,
+                        now,
+                    )
+                    for (definition_id, field_name), (
+                        durations,
+                        queries,
+                    ) in samples.items()
+                ),
+                max_samples=MAX_SAMPLES,
+            )
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE %(table)s AS profile
+                   SET p95_time = (
+                        SELECT percentile_cont(0.95) WITHIN GROUP (
+                                ORDER BY sample.value::float
+                               )
+                          FROM jsonb_array_elements_text(profile.samples)
+                               AS sample(value)
+                       )
+                 WHERE profile.id = ANY(%(ids)s)
+                """,
+                table=SQL.identifier(self._table),
+                ids=[profile_id for (profile_id,) in rows],
+            )
+        )
+        self.invalidate_model()
+        self.env["tier.definition"].invalidate_model(["profile_ids"])
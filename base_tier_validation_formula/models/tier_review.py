@@ -1,9 +1,10 @@
 # Copyright 2019 ForgeFlow S.L.
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
+from collections import defaultdict
+
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
-from odoo.tools.safe_eval import safe_eval
 
 
 class TierReview(models.Model):
@@ -29,29 +30,40 @@ class TierReview(models.Model):
 
     @api.depends("definition_id.reviewer_expression", "review_type", "model", "res_id")
     def _compute_python_reviewer_ids(self):
-        for rec in self:
-            if rec.review_type != "expression":
-                rec.python_reviewer_ids = self.env["res.users"].browse()
-                continue
-            record = rec.env[rec.model].browse(rec.res_id).exists()
-            try:
-                reviewer_ids = safe_eval(
-                    rec.definition_id.reviewer_expression, globals_dict={"rec": record}
-                )
-            except Exception as error:
-                raise UserError(
-                    _("Error evaluating tier validation " "conditions.\n %s") % error
-                ) from error
-            # Check if python expression returns 'res.users' recordset
-            if (
-                not isinstance(reviewer_ids, models.Model)
-                or reviewer_ids._name != "res.users"
-            ):
-                raise UserError(
-                    _(
-                        "Reviewer python expression must return a "
-                        "res.users recordset."
-                    )
-                )
-            else:
-                rec.python_reviewer_ids = reviewer_ids
+        expression_reviews = self.filtered(lambda r: r.review_type == "expression")
+        (self - expression_reviews).python_reviewer_ids = False
+        reviews_by_reviewers = defaultdict(lambda: self.browse())
+        for (definition, model), reviews in expression_reviews.grouped(
+            lambda r: (r.definition_id, r.model)
+        ).items():
+            # Check the existence of all the documents with a single query
+            documents = self.env[model].browse(set(reviews.mapped("res_id"))).exists()
+            existing_ids = set(documents.ids)
+            for rec in reviews:
+                record = documents.browse(
+                    rec.res_id if rec.res_id in existing_ids else ()
+                ).with_prefetch(documents._prefetch_ids)
+                reviewer_ids = rec._eval_reviewer_expression(definition, record)
+                reviews_by_reviewers[reviewer_ids] |= rec
+        for reviewer_ids, reviews in reviews_by_reviewers.items():
+            reviews.python_reviewer_ids = reviewer_ids
+
+    @api.model
+    def _eval_reviewer_expression(self, definition, record):
+        try:
+            reviewer_ids = definition._eval_expression(
+                "reviewer_expression", {"rec": record}
+            )
+        except Exception as error:
+            raise UserError(
+                _("Error evaluating tier validation " "conditions.\n %s") % error
+            ) from error
+        # Check if python expression returns 'res.users' recordset
+        if (
+            not isinstance(reviewer_ids, models.Model)
+            or reviewer_ids._name != "res.users"
+        ):
+            raise UserError(
+                _("Reviewer python expression must return a " "res.users recordset.")
+            )
+        return reviewer_ids
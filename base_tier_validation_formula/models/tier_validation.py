@@ -3,7 +3,6 @@
 
 from odoo import _, models
 from odoo.exceptions import UserError
-from odoo.tools.safe_eval import safe_eval
 
 
 class TierValidation(models.AbstractModel):
@@ -11,17 +10,54 @@ class TierValidation(models.AbstractModel):
 
     def evaluate_formula_tier(self, tier):
         try:
-            res = safe_eval(tier.python_code, globals_dict={"rec": self})
+            res = tier._eval_expression("python_code", {"rec": self})
         except Exception as error:
             raise UserError(
                 _("Error evaluating tier validation conditions.\n %s") % error
             ) from error
         return res
 
+    def evaluate_batch_formula_tier(self, tier):
+        """Records of ``self`` matching the batch formula of ``tier``, which
+        is evaluated once on the whole recordset."""
+        try:
+            res = tier._eval_expression("python_code", {"recs": self})
+        except Exception as error:
+            raise UserError(
+                _("Error evaluating tier validation conditions.\n %s") % error
+            ) from error
+        if isinstance(res, models.BaseModel) and res._name == self._name:
+            matching_ids = set(res.ids)
+        elif isinstance(res, list | tuple | set) and all(
+            isinstance(res_id, int) for res_id in res
+        ):
+            matching_ids = set(res)
+        else:
+            raise UserError(
+                _(
+                    "Batch formula must return a recordset of %(model)s "
+                    "or a list of ids.",
+                    model=self._name,
+                )
+            )
+        return self.filtered(lambda rec: rec.id in matching_ids)
+
     def evaluate_tier(self, tier):
         res = super().evaluate_tier(tier)
         if tier.definition_type == "formula":
             return self.evaluate_formula_tier(tier)
         if tier.definition_type == "domain_formula":
             return res and self.evaluate_formula_tier(tier)
+        if tier.definition_type == "batch_formula":
+            return self.evaluate_batch_formula_tier(tier)
+        return res
+
+    def _evaluate_tier_batch(self, tier):
+        if tier.definition_type == "formula":
+            return self.filtered(lambda rec: rec.evaluate_formula_tier(tier))
+        if tier.definition_type == "batch_formula":
+            return self.evaluate_batch_formula_tier(tier)
+        res = super()._evaluate_tier_batch(tier)
+        if tier.definition_type == "domain_formula":
+            return res.filtered(lambda rec: rec.evaluate_formula_tier(tier))
         return res
@@ -156,3 +156,131 @@ class TierTierValidation(BaseCommon):
         self.test_record.write({"test_field": 3.5, "user_id": self.test_user_2.id})
         reviews = self.test_record.with_user(self.test_user_3.id).request_validation()
         self.assertTrue(reviews)
+
+    def test_06_compiled_python_code_cache(self):
+        tier_definition = self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "individual",
+                "reviewer_id": self.test_user_1.id,
+                "definition_type": "formula",
+                "python_code": "rec.test_field > 3.0",
+            }
+        )
+        records = self.test_model.create([{"test_field": 2.5}, {"test_field": 3.5}])
+        self.assertEqual(records._evaluate_tier_batch(tier_definition), records[1])
+        function = tier_definition._get_expression_function(
+            tier_definition.id,
+            "python_code",
+            tier_definition.write_date,
+            tier_definition.python_code,
+            ("rec",),
+        )
+        self.assertIs(
+            function,
+            tier_definition._get_expression_function(
+                tier_definition.id,
+                "python_code",
+                tier_definition.write_date,
+                tier_definition.python_code,
+                ("rec",),
+            ),
+        )
+        self.assertTrue(function(rec=records[1]))
+        # A new version of the expression is compiled again
+        tier_definition.python_code = "rec.test_field > 2.0"
+        self.assertEqual(records._evaluate_tier_batch(tier_definition), records)
+
+    def test_07_definition_from_batch_formula(self):
+        tier_definition = self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "individual",
+                "reviewer_id": self.test_user_1.id,
+                "definition_type": "batch_formula",
+                "python_code": "recs.filtered_domain([('test_field', '>', 3.0)])",
+            }
+        )
+        records = self.test_model.create([{"test_field": 2.5}, {"test_field": 3.5}])
+        self.assertEqual(records._evaluate_tier_batch(tier_definition), records[1])
+        self.assertFalse(records[0].evaluate_tier(tier_definition))
+        # The expression can return ids as well
+        tier_definition.python_code = (
+            "recs.search([('id', 'in', recs.ids), ('test_field', '<', 3.0)]).ids"
+        )
+        self.assertEqual(records._evaluate_tier_batch(tier_definition), records[0])
+        reviews = records.with_user(self.test_user_3).request_validation()
+        self.assertIn(tier_definition, reviews.definition_id)
+        self.assertEqual(
+            reviews.filtered(lambda r: r.definition_id == tier_definition).res_id,
+            records[0].id,
+        )
+        tier_definition.python_code = "True"
+        with self.assertRaises(UserError):
+            records._evaluate_tier_batch(tier_definition)
+
+    def test_08_reviewer_expression_batch(self):
+        tier_definition = self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "expression",
+                "reviewer_expression": "rec.user_id",
+                "definition_type": "formula",
+                "python_code": "rec.test_field > 3.0",
+            }
+        )
+        records = self.test_model.create(
+            [
+                {"test_field": 3.5, "user_id": self.test_user_2.id},
+                {"test_field": 4.5, "user_id": self.test_user_3.id},
+                {"test_field": 5.5, "user_id": self.test_user_2.id},
+            ]
+        )
+        reviews = records.with_user(self.test_user_1).request_validation()
+        expression_reviews = reviews.filtered(
+            lambda r: r.definition_id == tier_definition
+        )
+        self.assertEqual(len(expression_reviews), 3)
+        for review in expression_reviews:
+            record = records.browse(review.res_id)
+            self.assertEqual(review.python_reviewer_ids, record.user_id)
+
+    def test_09_expression_profiling(self):
+        self.env["ir.config_parameter"].sudo().set_param(
+            "base_tier_validation_formula.profile_expressions", True
+        )
+        tier_definition = self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "expression",
+                "reviewer_expression": "rec.user_id",
+                "definition_type": "formula",
+                "python_code": "rec.test_field > 3.0",
+            }
+        )
+        records = self.test_model.create(
+            [
+                {"test_field": 2.5, "user_id": self.test_user_2.id},
+                {"test_field": 3.5, "user_id": self.test_user_2.id},
+            ]
+        )
+        records.with_user(self.test_user_1).request_validation()
+        Profile = self.env["tier.definition.profile"]
+        Profile._save_samples(Profile._pop_samples())
+        profiles = tier_definition.profile_ids
+        self.assertEqual(
+            set(profiles.mapped("expression")),
+            {"python_code", "reviewer_expression"},
+        )
+        code_profile = profiles.filtered(lambda p: p.expression == "python_code")
+        call_count = code_profile.call_count
+        self.assertGreaterEqual(call_count, 2)
+        self.assertEqual(len(code_profile.samples), call_count)
+        self.assertGreater(code_profile.p95_time, 0.0)
+        self.assertLessEqual(code_profile.p95_time, code_profile.total_time)
+        # Samples of the next transactions are added up
+        records._evaluate_tier_batch(tier_definition)
+        Profile._save_samples(Profile._pop_samples())
+        self.assertEqual(code_profile.call_count, call_count + 2)
+        tier_definition.action_reset_profile()
+        self.assertFalse(tier_definition.profile_ids)
@@ -3,7 +3,7 @@
 {
     "name": "Base Tier Validation - Server Action",
     "summary": "Add option to call server action when a tier is validated",
-    "version": "18.0.1.0.0",
+    "version": "18.0.1.1.0",
     "category": "Tools",
     "website": "https://github.com/OCA/server-ux",
     "author": "Ecosoft, Odoo Community Association (OCA)",
@@ -12,8 +12,10 @@
     "installable": True,
     "depends": ["base_tier_validation"],
     "data": [
+        "security/ir.model.access.csv",
         "data/cron_data.xml",
         "views/tier_definition_view.xml",
+        "views/tier_review_action_view.xml",
     ],
     "maintainers": ["kittiu"],
     "development_status": "Beta",
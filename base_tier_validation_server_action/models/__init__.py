@@ -1,4 +1,6 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
 from . import tier_definition
+from . import tier_review
+from . import tier_review_action
 from . import tier_validation
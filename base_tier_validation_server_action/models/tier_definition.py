@@ -1,9 +1,13 @@
 # Copyright 2020 Ecosoft (http://ecosoft.co.th)
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 import logging
+import time
 from ast import literal_eval
+from collections import defaultdict
 
-from odoo import api, fields, models
+from odoo import api, fields, models, modules
+from odoo.osv import expression
+from odoo.tools import SQL
 
 _logger = logging.getLogger(__name__)
 
@@ -36,31 +40,255 @@ class TierDefinition(models.Model):
         domain = review.definition_id.auto_validate_domain or "[]"
         return doc.filtered_domain(literal_eval(domain))
 
+    def _get_auto_validate_res_ids(self, res_ids):
+        """Ids among ``res_ids`` of the documents passing the auto validate
+        domain, read with a single search."""
+        self.ensure_one()
+        domain = literal_eval(self.auto_validate_domain or "[]")
+        documents = (
+            self.env[self.model]
+            .sudo()
+            .with_context(active_test=False)
+            .search(expression.AND([[("id", "in", list(res_ids))], domain]))
+        )
+        return set(documents.ids)
+
     @api.model
-    def _cron_auto_tier_validation(self):
-        reviews = self.env["tier.review"].search(
-            [
-                ("status", "in", ("waiting", "pending")),
-                ("definition_id.auto_validate", "=", True),
-            ]
+    def _claim_auto_validate_reviews(self, cutoff, limit):
+        """Lock up to ``limit`` documents with open reviews to auto validate
+        that were not evaluated since ``cutoff``, and return these reviews.
+
+        A document is claimed by locking its lowest open review: validating
+        a review rewrites the other reviews of its document, so they are all
+        handled by the same worker. Documents locked by another worker are
+        skipped, so that several runs of the job can share the work. The
+        claimed reviews are stamped as evaluated right away: a status change
+        resets the stamp and makes them claimable again.
+        """
+        Review = self.env["tier.review"]
+        Review.flush_model(
+            ["model", "res_id", "sequence", "definition_id", "status"]
+            + ["auto_validate_date"]
         )
+        self.flush_model(["auto_validate"])
+        rows = self.env.execute_query(
+            SQL(
+                """
+                WITH claimed AS (
+                    SELECT head.model, head.res_id
+                      FROM tier_review head
+                     WHERE head.status IN ('waiting', 'pending')
+                       AND NOT EXISTS (
+                            SELECT 1
+                              FROM tier_review lower
+                             WHERE lower.model = head.model
+                               AND lower.res_id = head.res_id
+                               AND lower.status IN ('waiting', 'pending')
+                               AND (lower.sequence, lower.id)
+                                   < (head.sequence, head.id)
+                       )
+                       AND EXISTS (
+                            SELECT 1
+                              FROM tier_review review
+                              JOIN tier_definition definition
+                                ON definition.id = review.definition_id
+                             WHERE review.model = head.model
+                               AND review.res_id = head.res_id
+                               AND %(due)s
+                       )
+                  ORDER BY head.model, head.res_id
+                     LIMIT %(limit)s
+                       FOR UPDATE OF head SKIP LOCKED
+                )
+                UPDATE tier_review review
+                   SET auto_validate_date = %(now)s
+                  FROM claimed, tier_definition definition
+                 WHERE review.model = claimed.model
+                   AND review.res_id = claimed.res_id
+                   AND definition.id = review.definition_id
+                   AND %(due)s
+             RETURNING review.id
+                """,
+                due=SQL(
+                    """
+                    definition.auto_validate
+                    AND review.status IN ('waiting', 'pending')
+                    AND (
+                        review.auto_validate_date IS NULL
+                        OR review.auto_validate_date < %s
+                    )
+                    """,
+                    cutoff,
+                ),
+                limit=limit,
+                now=fields.Datetime.now(),
+            )
+        )
+        Review.invalidate_model(["auto_validate_date"])
+        return Review.browse(sorted(review_id for (review_id,) in rows))
+
+    @api.model
+    def _get_auto_validate_cutoff(self, recheck_delay=None):
+        """Reviews evaluated before the returned date are evaluated again.
+
+        ``recheck_delay`` is in minutes, and defaults to half the interval
+        of the job: the reviews evaluated by a run are evaluated again by
+        the next one, but not by the runs chained when the time budget of a
+        run is spent.
+        """
+        now = fields.Datetime.now()
+        if recheck_delay is not None:
+            return fields.Datetime.subtract(now, minutes=recheck_delay)
+        cron = self.env.ref(
+            "base_tier_validation_server_action.ir_cron_auto_tier_validation",
+            raise_if_not_found=False,
+        )
+        if not cron:
+            return fields.Datetime.subtract(now, minutes=30)
+        interval = now - fields.Datetime.subtract(
+            now, **{cron.interval_type: cron.interval_number}
+        )
+        return now - interval / 2
+
+    @api.model
+    def _cron_auto_tier_validation(
+        self, batch_size=200, time_budget=600, recheck_delay=None
+    ):
+        """Auto validate the open reviews by batches of ``batch_size``
+        documents, committing after each batch.
+
+        Batches are claimed with ``FOR UPDATE SKIP LOCKED``: the job can be
+        duplicated to run several workers at the same time. A failing batch
+        is logged and skipped without stopping the others. Reviews evaluated
+        less than ``recheck_delay`` minutes ago are left out, and the job is
+        triggered again right away when ``time_budget`` seconds are spent
+        with reviews left.
+        """
+        cutoff = self._get_auto_validate_cutoff(recheck_delay)
+        start = time.monotonic()
+        done = 0
+        while True:
+            reviews = self._claim_auto_validate_reviews(cutoff, batch_size)
+            if not reviews:
+                break
+            try:
+                with self.env.cr.savepoint():
+                    self._auto_validate_claimed_reviews(reviews)
+            except Exception:
+                _logger.exception(
+                    "Auto tier validation failed on a batch of %s reviews",
+                    len(reviews),
+                )
+            done += len(reviews)
+            if not modules.module.current_test:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
+            _logger.info("Auto tier validation: %s reviews evaluated", done)
+            if time.monotonic() - start > time_budget:
+                break
+        remaining = 0
+        if reviews:
+            remaining = self.env["tier.review"].search_count(
+                [
+                    ("status", "in", ("waiting", "pending")),
+                    ("definition_id.auto_validate", "=", True),
+                    "|",
+                    ("auto_validate_date", "=", False),
+                    ("auto_validate_date", "<", cutoff),
+                ]
+            )
+        self.env["ir.cron"]._notify_progress(done=done, remaining=remaining)
+
+    @api.model
+    def _auto_validate_claimed_reviews(self, reviews):
+        """Validate the ``reviews`` that can be, by rounds: validating a tier
+        opens the next one of its document, which is validated in the next
+        round, until a round has nothing left to handle."""
+        while reviews:
+            handled = self.env["tier.review"]
+            for definition, definition_reviews in reviews.grouped(
+                "definition_id"
+            ).items():
+                handled |= definition._auto_validate_reviews(definition_reviews)
+            if not handled:
+                break
+            reviews -= handled
+
+    def _auto_validate_reviews(self, reviews):
+        """Validate the ``reviews`` of this definition whose document passes
+        the auto validate domain, in batches per reviewer.
+
+        Return the reviews handled: validated, failed or left out. The other
+        ones are waiting for a lower tier of their document.
+        """
+        self.ensure_one()
+        res_ids = self._get_auto_validate_res_ids(set(reviews.mapped("res_id")))
+        handled = self.env["tier.review"]
+        reviews_by_reviewer = defaultdict(lambda: self.env["tier.review"])
         for review in reviews:
-            doc = self._evaluate_review(review)
-            if not doc:
+            if review.res_id not in res_ids:
+                handled |= review
                 continue
-            try:
-                reviewer = review.reviewer_ids or self.env.user
-                if len(reviewer) > 1:
-                    _logger.warning(
-                        f"Cannot auto tier validate {doc}: " "too many reviewers"
+            if len(review.reviewer_ids) > 1:
+                doc = self.env[review.model].browse(review.res_id)
+                _logger.warning(
+                    f"Cannot auto tier validate {doc}: " "too many reviewers"
+                )
+                handled |= review
+                continue
+            reviews_by_reviewer[review.reviewer_ids or self.env.user] |= review
+        for reviewer, reviewer_reviews in reviews_by_reviewer.items():
+            handled |= self._auto_validate_reviewer_reviews(
+                reviewer, reviewer_reviews
+            )
+        return handled
+
+    def _auto_validate_reviewer_reviews(self, reviewer, reviews):
+        """Validate as ``reviewer`` those of ``reviews`` it can review now,
+        all at once, and return them.
+
+        The validations share a savepoint and a single counter update. When
+        one of them fails, they are done again document by document so that
+        only the failing ones are left out.
+        """
+        self.ensure_one()
+        docs = (
+            self.env[self.model]
+            .with_user(reviewer)
+            .browse(reviews.mapped("res_id"))
+        )
+        # Built again on each round, the previous one opened the next tiers
+        index = docs._get_review_index()
+        to_validate = reviews.filtered(
+            lambda review: review.sequence
+            in docs._get_indexed_sequences_to_approve(index[review.res_id], reviewer)
+        )
+        if not to_validate:
+            return to_validate
+        try:
+            with self.env.cr.savepoint():
+                validated_docs = self._auto_validate_documents(docs, to_validate)
+        except Exception:
+            validated_docs = docs.browse()
+            for res_id, doc_reviews in to_validate.grouped("res_id").items():
+                try:
+                    with self.env.cr.savepoint():
+                        validated_docs |= self._auto_validate_documents(
+                            docs, doc_reviews
+                        )
+                except Exception as e:
+                    _logger.error(
+                        f"Cannot auto tier validate {docs.browse(res_id)}: {e}"
                     )
-                    continue
-                review_doc = doc.with_user(reviewer)
-                if review_doc.can_review:
-                    sequences = review_doc._get_sequences_to_approve(reviewer)
-                    if review.sequence in sequences:
-                        review_doc._validate_tier(review)
-                        review_doc._update_counter({"review_deleted": True})
-                        _logger.info(f"Auto tier validate on {review_doc}")
-            except Exception as e:
-                _logger.error(f"Cannot auto tier validate {doc}: {e}")
+        validated_docs._update_counter({"review_deleted": True})
+        return to_validate
+
+    def _auto_validate_documents(self, docs, reviews):
+        """Validate the ``reviews`` on their documents among ``docs`` and
+        return these documents."""
+        validated_docs = docs.browse()
+        for res_id, doc_reviews in reviews.grouped("res_id").items():
+            review_doc = docs.browse(res_id)
+            review_doc._validate_tier(doc_reviews)
+            validated_docs |= review_doc
+            _logger.info(f"Auto tier validate on {review_doc}")
+        return validated_docs
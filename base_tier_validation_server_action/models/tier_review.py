@@ -0,0 +1,19 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import fields, models
+
+
+class TierReview(models.Model):
+    _inherit = "tier.review"
+
+    auto_validate_date = fields.Datetime(
+        readonly=True,
+        copy=False,
+        help="Last time the auto validation job evaluated this review, reset "
+        "when the status of the review changes.",
+    )
+
+    def write(self, vals):
+        if "status" in vals:
+            vals = dict(vals, auto_validate_date=False)
+        return super().write(vals)
@@ -0,0 +1,183 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+import logging
+import time
+
+from odoo import api, fields, models, modules
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+
+class TierReviewAction(models.Model):
+    """Server action to run once a review is approved or rejected.
+
+    One row is queued per review and server action, and the rows are run
+    after the commit of the review by a scheduled action, so that each
+    server action runs exactly once per review.
+    """
+
+    _name = "tier.review.action"
+    _description = "Tier Review Server Action Execution"
+    _order = "id desc"
+
+    review_id = fields.Many2one(
+        comodel_name="tier.review", required=True, ondelete="cascade", index=True
+    )
+    server_action_id = fields.Many2one(
+        comodel_name="ir.actions.server", required=True, ondelete="cascade"
+    )
+    model = fields.Char(string="Related Document Model", required=True)
+    res_id = fields.Many2oneReference(
+        string="Related Document ID", model_field="model", required=True
+    )
+    user_id = fields.Many2one(
+        comodel_name="res.users",
+        string="Reviewer",
+        help="User whose review queued the server action, the action is run "
+        "on its behalf.",
+    )
+    state = fields.Selection(
+        selection=[("queued", "Queued"), ("done", "Done"), ("failed", "Failed")],
+        default="queued",
+        required=True,
+        index=True,
+    )
+    date_done = fields.Datetime(readonly=True)
+    error = fields.Text(readonly=True)
+
+    _sql_constraints = [
+        (
+            "review_server_action_uniq",
+            "unique(review_id, server_action_id)",
+            "A server action runs only once per review.",
+        )
+    ]
+
+    @api.model
+    def _enqueue(self, vals_list):
+        """Queue the server actions of ``vals_list`` and wake up the worker.
+
+        Actions already queued or run for the same review are ignored.
+        """
+        if not vals_list:
+            return
+        now = fields.Datetime.now()
+        uid = self.env.uid
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO %(table)s (
+                    review_id, server_action_id, model, res_id, user_id, state,
+                    create_uid, create_date, write_uid, write_date
+                )
+                VALUES %(values)s
+                ON CONFLICT (review_id, server_action_id) DO NOTHING
+                """,
+                table=SQL.identifier(self._table),
+                values=SQL(", ").join(
+                    SQL(
+                        "(%s, %s, %s, %s, %s, 'queued', %s, %s, %s, %s)",
+                        vals["review_id"],
+                        vals["server_action_id"],
+                        vals["model"],
+                        vals["res_id"],
+                        uid,
+                        uid,
+                        now,
+                        uid,
+                        now,
+                    )
+                    for vals in vals_list
+                ),
+            )
+        )
+        if self.env.cr.rowcount:
+            cron = self.env.ref(
+                "base_tier_validation_server_action.ir_cron_tier_review_action",
+                raise_if_not_found=False,
+            )
+            if cron:
+                cron._trigger()
+
+    @api.model
+    def _claim_queued(self, limit):
+        """Lock and return up to ``limit`` queued executions, skipping the
+        ones locked by another worker."""
+        self.flush_model(["state"])
+        rows = self.env.execute_query(
+            SQL(
+                """
+                SELECT id
+                  FROM %s
+                 WHERE state = 'queued'
+              ORDER BY server_action_id, id
+                 LIMIT %s
+                   FOR UPDATE SKIP LOCKED
+                """,
+                SQL.identifier(self._table),
+                limit,
+            )
+        )
+        return self.browse([execution_id for (execution_id,) in rows])
+
+    @api.model
+    def _cron_run_queued(self, batch_size=100, time_budget=600):
+        """Run the queued server actions by batches of ``batch_size``,
+        grouped by server action and committing after each batch."""
+        start = time.monotonic()
+        done = 0
+        while True:
+            executions = self._claim_queued(batch_size)
+            if not executions:
+                break
+            for server_action, action_executions in executions.grouped(
+                "server_action_id"
+            ).items():
+                action_executions._run_server_action(server_action)
+            done += len(executions)
+            if not modules.module.current_test:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
+            if time.monotonic() - start > time_budget:
+                break
+        remaining = 0
+        if executions:
+            remaining = self.search_count([("state", "=", "queued")])
+        self.env["ir.cron"]._notify_progress(done=done, remaining=remaining)
+
+    def _run_server_action(self, server_action):
+        """Run ``server_action`` on the document of each execution. A failing
+        execution is recorded as such without stopping the others."""
+        succeeded = self.browse()
+        for execution in self:
+            try:
+                with self.env.cr.savepoint():
+                    server_action.with_user(
+                        execution.user_id or self.env.user
+                    ).with_context(
+                        server_action_tier=server_action.id,
+                        active_model=execution.model,
+                        active_id=execution.res_id,
+                        active_ids=[execution.res_id],
+                    ).sudo().run()
+            except Exception as e:
+                _logger.exception(
+                    "Cannot run %s on %s,%s",
+                    server_action,
+                    execution.model,
+                    execution.res_id,
+                )
+                execution.write({"state": "failed", "error": str(e)})
+                continue
+            succeeded |= execution
+        succeeded.write(
+            {"state": "done", "date_done": fields.Datetime.now(), "error": False}
+        )
+
+    def action_retry(self):
+        self.filtered(lambda execution: execution.state == "failed").write(
+            {"state": "queued", "error": False}
+        )
+        self.env.ref(
+            "base_tier_validation_server_action.ir_cron_tier_review_action"
+        )._trigger()
+        return True
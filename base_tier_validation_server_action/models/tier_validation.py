@@ -8,33 +8,46 @@ class TierValidation(models.AbstractModel):
     _inherit = "tier.validation"
 
     def _server_action_tier(self, reviews, status):
+        """Queue the server actions of ``reviews``, they are run once per
+        review after the commit."""
+        server_action_tier = self.env.context.get("server_action_tier")
+        vals_list = []
         for review in reviews:
             if status == "approved":
                 server_action = review.definition_id.server_action_id
             if status == "rejected":
                 server_action = review.definition_id.rejected_server_action_id
-            server_action_tier = self.env.context.get("server_action_tier")
             # Don't allow reentrant server action as it will lead to
             # recursive behaviour
-            if server_action and (
-                not server_action_tier or server_action_tier != server_action.id
-            ):
-                server_action.with_context(
-                    server_action_tier=server_action.id,
-                    active_model=self._name,
-                    active_id=self.id,
-                ).sudo().run()
+            if server_action and server_action_tier != server_action.id:
+                vals_list.append(
+                    {
+                        "review_id": review.id,
+                        "server_action_id": server_action.id,
+                        "model": self._name,
+                        "res_id": self.id,
+                    }
+                )
+        self.env["tier.review.action"]._enqueue(vals_list)
 
     def _validate_tier(self, tiers=False):
         self.ensure_one()
+        approved = self.review_ids.filtered(lambda review: review.status == "approved")
         res = super()._validate_tier(tiers)
-        reviews = self.review_ids.filtered(lambda review: review.status == "approved")
+        reviews = (
+            self.review_ids.filtered(lambda review: review.status == "approved")
+            - approved
+        )
         self._server_action_tier(reviews, "approved")
         return res
 
     def _rejected_tier(self, tiers=False):
         self.ensure_one()
+        rejected = self.review_ids.filtered(lambda review: review.status == "rejected")
         res = super()._rejected_tier(tiers)
-        reviews = self.review_ids.filtered(lambda review: review.status == "rejected")
+        reviews = (
+            self.review_ids.filtered(lambda review: review.status == "rejected")
+            - rejected
+        )
         self._server_action_tier(reviews, "rejected")
         return res
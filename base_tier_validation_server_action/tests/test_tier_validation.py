@@ -2,6 +2,7 @@
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
 from odoo_test_helper import FakeModelLoader
 
+from odoo import fields
 from odoo.tests import common
 from odoo.tests.common import tagged
 
@@ -184,6 +185,9 @@ class TierTierValidation(common.TransactionCase):
         record = test_record.with_user(self.test_user_1)
         record.invalidate_recordset()
         record.validate_tier()
+        # The server action runs after the commit
+        self.assertFalse(record.test_bool)
+        self.env["tier.review.action"]._cron_run_queued()
         self.assertTrue(record.test_bool)
 
     def test_4_trigger_rejected_server_action(self):
@@ -213,4 +217,150 @@ class TierTierValidation(common.TransactionCase):
         record = test_record.with_user(self.test_user_1)
         record.invalidate_recordset()
         record.reject_tier()
+        self.assertFalse(record.test_bool)
+        self.env["tier.review.action"]._cron_run_queued()
         self.assertTrue(record.test_bool)
+
+    def test_5_auto_validation_batch(self):
+        # Create new test records, only the first ones pass the domain
+        records = self.test_model.create(
+            [{"test_field": 4.0}, {"test_field": 5.0}, {"test_field": 2.5}]
+        )
+        self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "individual",
+                "reviewer_id": self.test_user_3.id,
+                "sequence": 40,
+                "auto_validate": True,
+                "auto_validate_domain": "[('test_field', '>', 3)]",
+            }
+        )
+        for record in records:
+            record.with_user(self.test_user_2).request_validation()
+        self.tier_def_obj._cron_auto_tier_validation()
+        auto_reviews = records.review_ids.filtered(
+            lambda review: review.definition_id.auto_validate
+        )
+        approved = auto_reviews.filtered(lambda review: review.status == "approved")
+        self.assertEqual(sorted(approved.mapped("res_id")), records[:2].ids)
+        self.assertEqual(approved.mapped("done_by"), self.test_user_3)
+
+    def test_6_auto_validation_claim(self):
+        test_record = self.test_model.create({"test_field": 2.5})
+        self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "individual",
+                "reviewer_id": self.test_user_3.id,
+                "sequence": 40,
+                "auto_validate": True,
+                "auto_validate_domain": "[('test_field', '>', 3)]",
+            }
+        )
+        test_record.with_user(self.test_user_2).request_validation()
+        review = test_record.review_ids.filtered(
+            lambda review: review.definition_id.auto_validate
+        )
+        self.tier_def_obj._cron_auto_tier_validation()
+        # Evaluated but not validated: not claimed again until it changes
+        self.assertNotEqual(review.status, "approved")
+        self.assertTrue(review.auto_validate_date)
+        cutoff = self.env.cr.now()
+        self.assertNotIn(
+            review, self.tier_def_obj._claim_auto_validate_reviews(cutoff, 100)
+        )
+        test_record.test_field = 4.0
+        review.status = "pending"
+        self.assertFalse(review.auto_validate_date)
+        self.tier_def_obj._cron_auto_tier_validation()
+        self.assertEqual(review.status, "approved")
+
+    def test_7_server_action_exactly_once(self):
+        test_record = self.test_model.create({"test_field": 2.5})
+        server_action = self.env["ir.actions.server"].create(
+            {
+                "name": "Increment test_field",
+                "model_id": self.tester_model.id,
+                "state": "code",
+                "code": "record.write({'test_field': record.test_field + 1})",
+            }
+        )
+        self.tier_def_obj.create(
+            {
+                "model_id": self.tester_model.id,
+                "review_type": "individual",
+                "reviewer_id": self.test_user_1.id,
+                "sequence": 20,
+                "server_action_id": server_action.id,
+            }
+        )
+        test_record.with_user(self.test_user_2).request_validation()
+        record = test_record.with_user(self.test_user_1)
+        record.invalidate_recordset()
+        record.validate_tier()
+        review = record.review_ids.filtered(
+            lambda review: review.definition_id.server_action_id
+        )
+        # Queuing the action of the review again is a no-op
+        record._server_action_tier(review, "approved")
+        Execution = self.env["tier.review.action"]
+        execution = Execution.search([("review_id", "=", review.id)])
+        self.assertEqual(len(execution), 1)
+        self.assertEqual(execution.state, "queued")
+        Execution._cron_run_queued()
+        Execution._cron_run_queued()
+        self.assertEqual(execution.state, "done")
+        self.assertEqual(test_record.test_field, 3.5)
+
+    def test_8_auto_validation_claim_document(self):
+        test_record = self.test_model.create({"test_field": 2.5})
+        for sequence in (10, 20):
+            self.tier_def_obj.create(
+                {
+                    "model_id": self.tester_model.id,
+                    "review_type": "individual",
+                    "reviewer_id": self.test_user_3.id,
+                    "sequence": sequence,
+                    "approve_sequence": True,
+                    "auto_validate": True,
+                    "auto_validate_domain": "[('test_field', '>', 3)]",
+                }
+            )
+        test_record.with_user(self.test_user_2).request_validation()
+        other_record = self.test_model.create({"test_field": 2.5})
+        other_record.with_user(self.test_user_2).request_validation()
+        # Claiming a document claims all its reviews to auto validate
+        cutoff = fields.Datetime.now()
+        reviews = self.tier_def_obj._claim_auto_validate_reviews(cutoff, 1)
+        self.assertEqual(set(reviews.mapped("res_id")), {test_record.id})
+        self.assertEqual(len(reviews), 2)
+        reviews = self.tier_def_obj._claim_auto_validate_reviews(cutoff, 1)
+        self.assertEqual(set(reviews.mapped("res_id")), {other_record.id})
+
+    def test_9_auto_validation_next_tiers(self):
+        test_record = self.test_model.create({"test_field": 4.0})
+        for sequence, reviewer in ((10, self.test_user_3), (20, self.test_user_1)):
+            self.tier_def_obj.create(
+                {
+                    "model_id": self.tester_model.id,
+                    "review_type": "individual",
+                    "reviewer_id": reviewer.id,
+                    "sequence": sequence,
+                    "approve_sequence": True,
+                    "auto_validate": True,
+                }
+            )
+        test_record.with_user(self.test_user_2).request_validation()
+        # Each validated tier opens the next one, validated in the same run
+        self.tier_def_obj._cron_auto_tier_validation()
+        auto_reviews = test_record.review_ids.filtered(
+            lambda review: review.definition_id.auto_validate
+        )
+        self.assertEqual(auto_reviews.mapped("status"), ["approved", "approved"])
+        self.assertEqual(
+            test_record.review_ids.filtered(
+                lambda review: not review.definition_id.auto_validate
+            ).status,
+            "pending",
+        )
@@ -1,6 +1,6 @@
 # Copyright 2019-2020 ForgeFlow S.L.
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
-from odoo import api, models
+from odoo import api, fields, models
 
 
 class PurchaseRequest(models.Model):
@@ -10,6 +10,9 @@ class PurchaseRequest(models.Model):
     _state_to = ["approved"]
 
     _tier_validation_manual_config = False
+    _tier_validation_amount_field = "estimated_cost"
+
+    validation_status = fields.Selection(store=True, index=True)
 
     @api.model
     def _get_under_validation_exceptions(self):
@@ -2,6 +2,7 @@
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl-3.0).
 
 from odoo.tests import common
+from odoo.tools import SQL
 
 
 class TestPurchaseRequest(common.TransactionCase):
@@ -12,6 +13,35 @@ class TestPurchaseRequest(common.TransactionCase):
         # common models
         cls.purchase_request = cls.env["purchase.request"]
         cls.tier_definition = cls.env["tier.definition"]
+        cls.reviewer = cls.env["res.users"].create(
+            {
+                "name": "Reviewer",
+                "login": "pr_tier_reviewer",
+                "groups_id": [
+                    (
+                        6,
+                        0,
+                        [
+                            cls.env.ref("base.group_user").id,
+                            cls.env.ref(
+                                "purchase_request.group_purchase_request_manager"
+                            ).id,
+                        ],
+                    )
+                ],
+            }
+        )
+        # Only rely on the definition of the tests
+        cls.tier_definition.search([("model", "=", "purchase.request")]).active = False
+        cls.tier_definition.create(
+            {
+                "model_id": cls.env.ref(
+                    "purchase_request.model_purchase_request"
+                ).id,
+                "review_type": "individual",
+                "reviewer_id": cls.reviewer.id,
+            }
+        )
 
     def test_get_under_validation_exceptions(self):
         self.assertIn(
@@ -22,3 +52,84 @@ class TestPurchaseRequest(common.TransactionCase):
         self.assertIn(
             "purchase.request", self.tier_definition._get_tier_validation_model_names()
         )
+
+    def test_stored_validation_status(self):
+        self.assertTrue(self.purchase_request._fields["validation_status"].store)
+        self.assertIn(
+            ("validation_status", "=", "validated"),
+            self.purchase_request._search_validated("=", True),
+        )
+        self.assertIn(
+            ("validation_status", "!=", "rejected"),
+            self.purchase_request._search_rejected("=", False),
+        )
+
+    def _read_validation_status(self, requests):
+        requests.flush_recordset(["validation_status"])
+        return dict(
+            self.env.execute_query(
+                SQL(
+                    "SELECT id, validation_status FROM purchase_request "
+                    "WHERE id = ANY(%s)",
+                    requests.ids,
+                )
+            )
+        )
+
+    def test_stored_validation_status_follows_reviews(self):
+        requests = self.purchase_request.create([{}, {}, {}])
+        approved, rejected, untouched = requests
+        self.assertEqual(
+            self._read_validation_status(requests),
+            dict.fromkeys(requests.ids, "no"),
+        )
+        (approved | rejected).request_validation()
+        self.assertEqual(
+            set(self._read_validation_status(approved | rejected).values()),
+            {"pending"},
+        )
+        approved.with_user(self.reviewer).validate_tier()
+        rejected.with_user(self.reviewer).reject_tier()
+        self.assertEqual(
+            self._read_validation_status(requests),
+            {
+                approved.id: "validated",
+                rejected.id: "rejected",
+                untouched.id: "no",
+            },
+        )
+        domain = [("id", "in", requests.ids)]
+        self.assertEqual(
+            self.purchase_request.search(domain + [("validated", "=", True)]),
+            approved,
+        )
+        self.assertEqual(
+            self.purchase_request.search(domain + [("rejected", "=", True)]),
+            rejected,
+        )
+        self.assertEqual(
+            self.purchase_request.search(
+                domain + [("validation_status", "=", "no")]
+            ),
+            untouched,
+        )
+
+    def test_backfill_validation_status(self):
+        requests = self.purchase_request.create([{}, {}])
+        requests[0].request_validation()
+        requests[0].with_user(self.reviewer).validate_tier()
+        self.env.flush_all()
+        # Rows created before the column existed
+        self.env.cr.execute(
+            SQL(
+                "UPDATE purchase_request SET validation_status = NULL "
+                "WHERE id = ANY(%s)",
+                requests.ids,
+            )
+        )
+        self.env.invalidate_all()
+        self.purchase_request._backfill_validation_status(batch_size=1)
+        self.assertEqual(
+            self._read_validation_status(requests),
+            {requests[0].id: "validated", requests[1].id: "no"},
+        )